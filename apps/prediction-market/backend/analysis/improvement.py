@@ -10,13 +10,18 @@ CLV Philosophy:
 - A -CLV trade that wins is still a bad trade
 """
 
-from datetime import datetime, timedelta
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Optional
-from statistics import mean, stdev
-from collections import defaultdict
+import heapq
+import io
 import math
+from operator import itemgetter
 
-from ..models.trade import Trade, TradeStatus, TradeSide
+import numpy as np
+
+from ..models.trade import Trade, TradeStatus, TradeSide, days_to_expiry, utcnow
 from ..models.performance import (
     TradeAnalysis,
     StrategyPerformance,
@@ -25,6 +30,282 @@ from ..models.performance import (
 )
 
 
+# Hoisted status constants for the per-trade hot paths. Trade.status is
+# always a TradeStatus member, so identity and frozenset membership apply.
+_WIN = TradeStatus.RESOLVED_WIN
+_RESOLVED_STATUSES = frozenset({TradeStatus.RESOLVED_WIN, TradeStatus.RESOLVED_LOSS})
+
+# Integer status codes used by the columnar (SoA) trade views
+_STATUS_CODES = {status: code for code, status in enumerate(TradeStatus)}
+_STATUS_CODES.update({status.value: code for status, code in list(_STATUS_CODES.items())})
+_STATUS_OPEN = _STATUS_CODES[TradeStatus.OPEN]
+_STATUS_WIN = _STATUS_CODES[TradeStatus.RESOLVED_WIN]
+_STATUS_LOSS = _STATUS_CODES[TradeStatus.RESOLVED_LOSS]
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Below this many values, plain-float reductions beat NumPy's per-call overhead
+_SMALL_N = 64
+
+
+def _to_us(dt: datetime) -> int:
+    """Microseconds since the epoch, treating naive datetimes as UTC."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _expiry_days(trade: Trade) -> Optional[int]:
+    """Whole days from entry to market end: the stored value, else derived."""
+    if trade.days_to_expiry_at_entry is not None:
+        return trade.days_to_expiry_at_entry
+    return days_to_expiry(trade.created_at, trade.market_end_date)
+
+
+def _max_drawdown(pnls: np.ndarray) -> float:
+    """Largest peak-to-trough drop of the cumulative P&L curve.
+    
+    The running peak starts at zero, i.e. before the first trade. Short
+    series use a scalar loop, which beats NumPy's per-call overhead.
+    """
+    if pnls.size < _SMALL_N:
+        cumulative = peak = drawdown = 0.0
+        for pnl in pnls.tolist():
+            cumulative += pnl
+            if cumulative > peak:
+                peak = cumulative
+            elif peak - cumulative > drawdown:
+                drawdown = peak - cumulative
+        return drawdown
+    cumulative = np.cumsum(pnls)
+    peak = np.maximum.accumulate(np.maximum(cumulative, 0.0))
+    return float((peak - cumulative).max())
+
+
+def _pnl_vec(amount: np.ndarray, entry_price: np.ndarray, won: np.ndarray) -> np.ndarray:
+    """Vectorized ResolutionAnalyzer._calculate_pnl over column arrays."""
+    return np.where(won, amount / entry_price * (1 - entry_price), -amount)
+
+
+def _clv_vec(entry_price: np.ndarray, closing_price: np.ndarray, side_yes: np.ndarray) -> np.ndarray:
+    """Vectorized ResolutionAnalyzer._calculate_clv (unrounded, NaN if no close).
+    
+    YES: (close - entry) / entry; NO: ((1 - entry) - close) / (1 - entry).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            side_yes,
+            (closing_price - entry_price) / entry_price,
+            ((1 - entry_price) - closing_price) / (1 - entry_price),
+        ) * 100
+
+
+def _mean_std(values: np.ndarray) -> tuple[float, float]:
+    """Mean and sample standard deviation (ddof=1) of a float array."""
+    return float(values.mean()), float(values.std(ddof=1))
+
+
+def _mean_std_small(values: array) -> tuple[float, float]:
+    """Mean and sample standard deviation (ddof=1) of a small array('d')."""
+    n = len(values)
+    avg = math.fsum(values) / n
+    var = math.fsum((x - avg) ** 2 for x in values) / (n - 1)
+    return avg, math.sqrt(var)
+
+
+# Message tables for ResolutionAnalyzer, aligned index-for-index with the
+# condition tuples built in _identify_positives / _identify_negatives /
+# _suggest_trade_improvements. Constant messages are shared as-is; only the
+# entries in _MESSAGE_TEMPLATES are formatted per trade.
+_CLV_POSITIVE = "Positive CLV of {clv:.1f}% - beat the closing line"
+_PRICE_MOVED = "Good timing - price moved {price_move:.0%} after entry"
+_CLV_NEGATIVE = "Negative CLV of {clv:.1f}% - entered at worse price than close"
+_OVERSIZED = "Position size ${amount:.0f} may be too large"
+_VOLATILE_CATEGORY = "Underperformed in {category} - high volatility category"
+_MESSAGE_TEMPLATES = frozenset(
+    (_CLV_POSITIVE, _PRICE_MOVED, _CLV_NEGATIVE, _OVERSIZED, _VOLATILE_CATEGORY)
+)
+_NO_POSITIVES = "No clear positives identified - review needed"
+_NO_SUGGESTIONS = "Continue current approach - this was a reasonable trade"
+
+_POSITIVE_MESSAGES = (
+    _CLV_POSITIVE,
+    "Exceptional edge identified (>10% CLV)",
+    "Trade resolved in our favor",
+    "Correctly identified underpriced longshot",
+    "Correctly faded overpriced favorite",
+    "Contrarian view validated - market was wrong",
+    "Momentum strategy captured directional move",
+    _PRICE_MOVED,
+)
+_NEGATIVE_MESSAGES = (
+    _CLV_NEGATIVE,
+    "Severely mispriced entry (>10% worse than close)",
+    "Trade resolved against us",
+    "Lost on high-probability position - consider hedging",
+    "Longshot didn't hit - expected but painful",
+    "Won despite negative CLV - got lucky, don't repeat this entry",
+    _OVERSIZED,
+    _VOLATILE_CATEGORY,
+)
+_SUGGESTION_MESSAGES = (
+    "Wait for better entry price - consider limit orders",
+    "Check if news/info was already priced in before entering",
+    "Review information sources - market knew something we didn't",
+    "High entry prices leave little room for profit - require higher edge",
+    "Low entry prices are often longshots - ensure sufficient edge",
+    "Momentum entry may have been too late - price already moved",
+    "Contrarian view may have been wrong - review thesis",
+    "Consider: was this truly contrarian or just wrong?",
+    "Consider smaller position sizes for uncertain bets",
+    "Long-dated markets: consider scaling in over time",
+)
+_VOLATILE_CATEGORIES = frozenset(("politics", "crypto"))
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray) -> float:
+    """Mean of values where mask is set, or 0 if the mask is empty."""
+    n = np.count_nonzero(mask)
+    return float(values[mask].sum() / n) if n else 0
+
+
+# Calibration buckets: bucket i covers [i/10, (i+1)/10). Edges are i/10
+# rather than an arange step so that e.g. 0.3 is exactly an edge.
+_BUCKET_EDGES = np.arange(11) / 10
+_BUCKET_BOUNDS = tuple(
+    (float(start), float(end)) for start, end in zip(_BUCKET_EDGES[:-1], _BUCKET_EDGES[1:])
+)
+_BUCKET_LABELS = tuple(f"{start:.2f}-{end:.2f}" for start, end in _BUCKET_BOUNDS)
+
+
+def _calibration_histogram(
+    entry: np.ndarray, won: np.ndarray, edges: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-bucket trade counts, wins and entry-price sums in one bucketing pass.
+    
+    Bucket i covers [edges[i], edges[i + 1]); prices outside the edges land
+    in the under/overflow bins, which are dropped from the result.
+    """
+    bucket = np.digitize(entry, edges)
+    nbins = edges.size + 1
+    inner = slice(1, edges.size)
+    counts = np.bincount(bucket, minlength=nbins)[inner]
+    wins = np.bincount(bucket, weights=won, minlength=nbins)[inner]
+    entry_sums = np.bincount(bucket, weights=entry, minlength=nbins)[inner]
+    return counts, wins, entry_sums
+
+
+@dataclass
+class _Columns:
+    """Column-oriented (SoA) view of a trade list for vectorized analysis.
+    
+    Row i of every array describes trades[i]; missing pnl is 0, missing clv NaN.
+    created_order sorts rows by created_us (created_sorted) for range bisects.
+    settled_us is resolution_date, falling back to created_at.
+    settled_pnl is the P&L the resolution analyzer reports: the stored pnl,
+    or the pnl implied by the outcome when it is missing or zero.
+    closing_clv is the CLV implied by closing_price, unlike the stored clv.
+    category_idx codes market_category in first-seen order (empty -> None);
+    expiry_days is days_to_expiry_at_entry where has_end, else 0.
+    """
+    strategy_codes: dict[str, int]
+    strategy_idx: np.ndarray
+    category_codes: dict[Optional[str], int]
+    category_idx: np.ndarray
+    expiry_days: np.ndarray
+    has_end: np.ndarray
+    created_us: np.ndarray
+    created_order: np.ndarray
+    created_sorted: np.ndarray
+    settled_us: np.ndarray
+    status: np.ndarray
+    resolved: np.ndarray
+    amount: np.ndarray
+    entry_price: np.ndarray
+    pnl: np.ndarray
+    settled_pnl: np.ndarray
+    clv: np.ndarray
+    closing_clv: np.ndarray
+
+
+@dataclass
+class _ResolvedView:
+    """Columns of the resolved trades only, in trade order.
+    
+    Shared by the tuner's sizing, timing, category and CLV analyses so the
+    resolved rows are gathered once instead of masked in every analysis.
+    """
+    clv: np.ndarray
+    has_clv: np.ndarray
+    amount: np.ndarray
+    category: np.ndarray
+    expiry_days: np.ndarray
+    has_end: np.ndarray
+
+
+def _build_columns(trades: list[Trade]) -> _Columns:
+    """Build the column view of trades in a single pass."""
+    codes: dict[str, int] = {}
+    category_codes: dict[Optional[str], int] = {}
+    strategy, created, settled, status, amount, entry_price, pnl, clv = [], [], [], [], [], [], [], []
+    closing_price, side_yes, category, expiry, has_end = [], [], [], [], []
+    for t in trades:
+        strategy.append(codes.setdefault(t.strategy, len(codes)))
+        category.append(category_codes.setdefault(t.market_category or None, len(category_codes)))
+        days = _expiry_days(t)
+        has_end.append(days is not None)
+        expiry.append(days or 0)
+        created.append(_to_us(t.created_at))
+        settled.append(created[-1] if t.resolution_date is None else _to_us(t.resolution_date))
+        status.append(_STATUS_CODES[t.status])
+        amount.append(t.amount)
+        entry_price.append(t.entry_price)
+        pnl.append(t.pnl or 0.0)
+        clv.append(math.nan if t.clv is None else t.clv)
+        closing_price.append(math.nan if t.closing_price is None else t.closing_price)
+        side_yes.append(t.side == TradeSide.YES)
+    
+    created_arr = np.array(created, dtype=np.int64)
+    created_order = np.argsort(created_arr, kind="stable")
+    status_arr = np.array(status, dtype=np.uint8)
+    resolved = (status_arr == _STATUS_WIN) | (status_arr == _STATUS_LOSS)
+    amount_arr = np.array(amount, dtype=np.float64)
+    entry_arr = np.array(entry_price, dtype=np.float64)
+    pnl_arr = np.array(pnl, dtype=np.float64)
+    
+    settled_pnl = pnl_arr.copy()
+    missing = resolved & (pnl_arr == 0)
+    settled_pnl[missing] = _pnl_vec(
+        amount_arr[missing], entry_arr[missing], status_arr[missing] == _STATUS_WIN
+    )
+    
+    return _Columns(
+        strategy_codes=codes,
+        strategy_idx=np.array(strategy, dtype=np.int32),
+        category_codes=category_codes,
+        category_idx=np.array(category, dtype=np.int32),
+        expiry_days=np.array(expiry, dtype=np.int64),
+        has_end=np.array(has_end, dtype=bool),
+        created_us=created_arr,
+        created_order=created_order,
+        created_sorted=created_arr[created_order],
+        settled_us=np.array(settled, dtype=np.int64),
+        status=status_arr,
+        resolved=resolved,
+        amount=amount_arr,
+        entry_price=entry_arr,
+        pnl=pnl_arr,
+        settled_pnl=settled_pnl,
+        clv=np.array(clv, dtype=np.float64),
+        closing_clv=_clv_vec(
+            entry_arr,
+            np.array(closing_price, dtype=np.float64),
+            np.array(side_yes, dtype=bool),
+        ),
+    )
+
+
 class ResolutionAnalyzer:
     """Analyzes trades after market resolution.
     
@@ -32,9 +313,40 @@ class ResolutionAnalyzer:
     generating actionable lessons for each trade.
     """
     
-    def __init__(self, trades: list[Trade] = None):
-        """Initialize with optional list of trades."""
+    def __init__(self, trades: list[Trade] = None, columns: Optional[_Columns] = None):
+        """Initialize with optional list of trades.
+        
+        columns may pass in an existing column view of the same trades
+        (e.g. a ParameterTuner's) instead of building another one.
+        """
         self.trades = trades or []
+        self._columns = columns
+    
+    @property
+    def trades(self) -> list[Trade]:
+        """Known trades; reassign (don't mutate) to refresh columns."""
+        return self._trades
+    
+    @trades.setter
+    def trades(self, trades: list[Trade]) -> None:
+        self._trades = trades
+        self._columns: Optional[_Columns] = None
+        self._rows: Optional[dict[int, int]] = None
+    
+    def _ensure_columns(self) -> _Columns:
+        """Column view of self.trades, built on first use."""
+        if self._columns is None:
+            self._columns = _build_columns(self._trades)
+        return self._columns
+    
+    def _row_of(self, trade: Trade) -> Optional[int]:
+        """Row of trade in the column view, or None for ad-hoc trades."""
+        if not self._trades:
+            return None
+        self._ensure_columns()
+        if self._rows is None:
+            self._rows = {id(t): i for i, t in enumerate(self._trades)}
+        return self._rows.get(id(trade))
     
     def analyze_resolved_trade(self, trade: Trade) -> TradeAnalysis:
         """Analyze a single resolved trade, generating lessons learned.
@@ -45,20 +357,78 @@ class ResolutionAnalyzer:
         Returns:
             TradeAnalysis with detailed breakdown and lessons
         """
-        if trade.status not in (TradeStatus.RESOLVED_WIN, TradeStatus.RESOLVED_LOSS):
+        if trade.status not in _RESOLVED_STATUSES:
             raise ValueError(f"Trade {trade.id} is not resolved")
         
-        won = trade.status == TradeStatus.RESOLVED_WIN
-        pnl = trade.pnl or self._calculate_pnl(trade, won)
+        won = trade.status is _WIN
+        row = self._row_of(trade)
+        if row is None:
+            pnl = trade.pnl or self._calculate_pnl(trade, won)
+            clv = self._calculate_clv(trade)
+        else:
+            pnl = float(self._columns.settled_pnl[row])
+            clv = self._columns.closing_clv[row]
+            clv = None if math.isnan(clv) else round(float(clv), 2)
         roi = (pnl / trade.amount) * 100 if trade.amount > 0 else 0
         
+        return self._build_analysis(
+            trade, won, pnl, roi, clv, self._assess_sizing_quality(trade)
+        )
+    
+    def analyze_resolved_trades(self, trades: list[Trade] = None) -> list[TradeAnalysis]:
+        """Analyze a batch of resolved trades.
+        
+        P&L, ROI, CLV and sizing quality are computed column-wise in one
+        pre-pass; only the lessons are generated trade by trade.
+        
+        Args:
+            trades: Resolved trades to analyze (resolved self.trades if None)
+            
+        Returns:
+            One TradeAnalysis per trade, in order
+        """
+        if trades is None:
+            cols = self._ensure_columns()
+            rows = np.flatnonzero(cols.resolved)
+            trades = [self._trades[i] for i in rows]
+        else:
+            for trade in trades:
+                if trade.status not in _RESOLVED_STATUSES:
+                    raise ValueError(f"Trade {trade.id} is not resolved")
+            cols = _build_columns(trades)
+            rows = np.arange(len(trades))
+        
+        amount = cols.amount[rows]
+        pnl = cols.settled_pnl[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi = np.where(amount > 0, pnl / amount * 100, 0.0)
+        good_sizing = (amount >= 1) & (amount <= 50)
+        won = cols.status[rows] == _STATUS_WIN
+        clv = [
+            None if math.isnan(c) else round(c, 2)
+            for c in cols.closing_clv[rows].tolist()
+        ]
+        
+        return [
+            self._build_analysis(*fields)
+            for fields in zip(trades, won.tolist(), pnl.tolist(), roi.tolist(), clv, good_sizing.tolist())
+        ]
+    
+    def _build_analysis(
+        self,
+        trade: Trade,
+        won: bool,
+        pnl: float,
+        roi: float,
+        clv: Optional[float],
+        was_good_sizing: bool,
+    ) -> TradeAnalysis:
+        """Assemble a TradeAnalysis from precomputed numbers, adding lessons."""
         # CLV analysis - the most important metric
-        clv = self._calculate_clv(trade)
         beat_closing_line = clv > 0 if clv is not None else None
         
         # Quality assessments
         was_good_entry = self._assess_entry_quality(trade, clv)
-        was_good_sizing = self._assess_sizing_quality(trade)
         
         # Generate lessons
         what_went_right = self._identify_positives(trade, won, clv)
@@ -149,37 +519,32 @@ class ResolutionAnalyzer:
         self, trade: Trade, won: bool, clv: Optional[float]
     ) -> list[str]:
         """Identify what went right in this trade."""
-        positives = []
-        
-        # CLV-based positives (most important)
-        if clv is not None and clv > 0:
-            positives.append(f"Positive CLV of {clv:.1f}% - beat the closing line")
-            if clv > 10:
-                positives.append("Exceptional edge identified (>10% CLV)")
-        
-        # Outcome-based positives
-        if won:
-            positives.append("Trade resolved in our favor")
-            if trade.entry_price < 0.3:
-                positives.append("Correctly identified underpriced longshot")
-            elif trade.entry_price > 0.7:
-                positives.append("Correctly faded overpriced favorite")
-        
-        # Strategy-specific positives
-        if trade.strategy == "contrarian" and clv and clv > 0:
-            positives.append("Contrarian view validated - market was wrong")
-        
-        if trade.strategy == "momentum" and won:
-            positives.append("Momentum strategy captured directional move")
-        
-        # Timing positives
-        if trade.closing_price is not None:
-            price_move = abs(trade.closing_price - trade.entry_price)
-            if price_move > 0.1:
-                positives.append(f"Good timing - price moved {price_move:.0%} after entry")
+        has_clv = clv is not None
+        price_move = (
+            abs(trade.closing_price - trade.entry_price)
+            if trade.closing_price is not None else 0.0
+        )
+        conds = (
+            # CLV-based positives (most important)
+            has_clv and clv > 0,
+            has_clv and clv > 10,
+            # Outcome-based positives
+            won,
+            won and trade.entry_price < 0.3,
+            won and trade.entry_price > 0.7,
+            # Strategy-specific positives
+            trade.strategy == "contrarian" and bool(clv) and clv > 0,
+            trade.strategy == "momentum" and won,
+            # Timing positives
+            price_move > 0.1,
+        )
+        positives = [
+            msg.format(clv=clv, price_move=price_move) if msg in _MESSAGE_TEMPLATES else msg
+            for cond, msg in zip(conds, _POSITIVE_MESSAGES) if cond
+        ]
         
         if not positives:
-            positives.append("No clear positives identified - review needed")
+            positives.append(_NO_POSITIVES)
         
         return positives
     
@@ -187,34 +552,27 @@ class ResolutionAnalyzer:
         self, trade: Trade, won: bool, clv: Optional[float]
     ) -> list[str]:
         """Identify what went wrong in this trade."""
-        negatives = []
-        
-        # CLV-based negatives (most important)
-        if clv is not None and clv < 0:
-            negatives.append(f"Negative CLV of {clv:.1f}% - entered at worse price than close")
-            if clv < -10:
-                negatives.append("Severely mispriced entry (>10% worse than close)")
-        
-        # Outcome-based negatives
-        if not won:
-            negatives.append("Trade resolved against us")
-            if trade.entry_price > 0.7:
-                negatives.append("Lost on high-probability position - consider hedging")
-            elif trade.entry_price < 0.3:
-                negatives.append("Longshot didn't hit - expected but painful")
-        
-        # Negative CLV but won (bad process, good luck)
-        if clv is not None and clv < 0 and won:
-            negatives.append("Won despite negative CLV - got lucky, don't repeat this entry")
-        
-        # Sizing issues
-        if trade.amount > 50:
-            negatives.append(f"Position size ${trade.amount:.0f} may be too large")
-        
-        # Category-specific issues
-        if trade.market_category in ["politics", "crypto"]:
-            if clv is not None and clv < -5:
-                negatives.append(f"Underperformed in {trade.market_category} - high volatility category")
+        has_clv = clv is not None
+        conds = (
+            # CLV-based negatives (most important)
+            has_clv and clv < 0,
+            has_clv and clv < -10,
+            # Outcome-based negatives
+            not won,
+            not won and trade.entry_price > 0.7,
+            not won and trade.entry_price < 0.3,
+            # Negative CLV but won (bad process, good luck)
+            has_clv and clv < 0 and won,
+            # Sizing issues
+            trade.amount > 50,
+            # Category-specific issues
+            trade.market_category in _VOLATILE_CATEGORIES and has_clv and clv < -5,
+        )
+        negatives = [
+            msg.format(clv=clv, amount=trade.amount, category=trade.market_category)
+            if msg in _MESSAGE_TEMPLATES else msg
+            for cond, msg in zip(conds, _NEGATIVE_MESSAGES) if cond
+        ]
         
         return negatives
     
@@ -226,42 +584,31 @@ class ResolutionAnalyzer:
         negatives: list[str],
     ) -> list[str]:
         """Generate specific improvement suggestions for this trade."""
-        suggestions = []
-        
-        # CLV-based suggestions
-        if clv is not None:
-            if clv < -5:
-                suggestions.append("Wait for better entry price - consider limit orders")
-                suggestions.append("Check if news/info was already priced in before entering")
-            if clv < -10:
-                suggestions.append("Review information sources - market knew something we didn't")
-        
-        # Entry price suggestions
-        if trade.entry_price > 0.85:
-            suggestions.append("High entry prices leave little room for profit - require higher edge")
-        if trade.entry_price < 0.15:
-            suggestions.append("Low entry prices are often longshots - ensure sufficient edge")
-        
-        # Strategy suggestions
-        if trade.strategy == "momentum" and clv and clv < 0:
-            suggestions.append("Momentum entry may have been too late - price already moved")
-        
-        if trade.strategy == "contrarian" and not won and clv and clv < 0:
-            suggestions.append("Contrarian view may have been wrong - review thesis")
-            suggestions.append("Consider: was this truly contrarian or just wrong?")
-        
-        # Sizing suggestions
-        if trade.amount > 30 and not won:
-            suggestions.append("Consider smaller position sizes for uncertain bets")
-        
-        # Timing suggestions
-        if trade.market_end_date:
-            time_to_expiry = trade.market_end_date - trade.created_at
-            if time_to_expiry.days > 30 and clv and clv < 0:
-                suggestions.append("Long-dated markets: consider scaling in over time")
+        has_clv = clv is not None
+        negative_clv = bool(clv) and clv < 0
+        days = _expiry_days(trade)
+        long_dated = days is not None and days > 30
+        conds = (
+            # CLV-based suggestions
+            has_clv and clv < -5,
+            has_clv and clv < -5,
+            has_clv and clv < -10,
+            # Entry price suggestions
+            trade.entry_price > 0.85,
+            trade.entry_price < 0.15,
+            # Strategy suggestions
+            trade.strategy == "momentum" and negative_clv,
+            trade.strategy == "contrarian" and not won and negative_clv,
+            trade.strategy == "contrarian" and not won and negative_clv,
+            # Sizing suggestions
+            trade.amount > 30 and not won,
+            # Timing suggestions
+            long_dated and negative_clv,
+        )
+        suggestions = [msg for cond, msg in zip(conds, _SUGGESTION_MESSAGES) if cond]
         
         if not suggestions:
-            suggestions.append("Continue current approach - this was a reasonable trade")
+            suggestions.append(_NO_SUGGESTIONS)
         
         return suggestions
     
@@ -273,27 +620,27 @@ class ResolutionAnalyzer:
         clv_str = f"{analysis.clv:+.1f}%" if analysis.clv else "N/A"
         quality = "🎯 Good entry" if analysis.was_good_entry else "⚠️ Poor entry"
         
-        lines = [
-            f"Trade {trade.id[:8]}... | {outcome} | CLV: {clv_str} | {quality}",
-            f"Strategy: {trade.strategy} | Entry: {trade.entry_price:.0%} | PnL: ${analysis.pnl:+.2f}",
-            "",
-            "What went right:" if analysis.what_went_right else "",
-        ]
+        buf = io.StringIO()
+        w = buf.write
+        w(f"Trade {trade.id[:8]}... | {outcome} | CLV: {clv_str} | {quality}\n"
+          f"Strategy: {trade.strategy} | Entry: {trade.entry_price:.0%} | PnL: ${analysis.pnl:+.2f}\n\n")
         
-        for item in analysis.what_went_right:
-            lines.append(f"  + {item}")
+        if analysis.what_went_right:
+            w("What went right:")
+            for item in analysis.what_went_right:
+                w(f"\n  + {item}")
         
         if analysis.what_went_wrong:
-            lines.append("\nWhat went wrong:")
+            w("\n\nWhat went wrong:")
             for item in analysis.what_went_wrong:
-                lines.append(f"  - {item}")
+                w(f"\n  - {item}")
         
         if analysis.suggested_improvements:
-            lines.append("\nLessons:")
+            w("\n\nLessons:")
             for item in analysis.suggested_improvements:
-                lines.append(f"  → {item}")
+                w(f"\n  → {item}")
         
-        return "\n".join(lines)
+        return buf.getvalue()
 
 
 class StrategyEvaluator:
@@ -307,6 +654,22 @@ class StrategyEvaluator:
         self.trades = trades or []
         self.resolution_analyzer = ResolutionAnalyzer()
     
+    @property
+    def trades(self) -> list[Trade]:
+        """Trades under evaluation; reassign (don't mutate) to refresh columns."""
+        return self._trades
+    
+    @trades.setter
+    def trades(self, trades: list[Trade]) -> None:
+        self._trades = trades
+        self._columns: Optional[_Columns] = None
+    
+    def _ensure_arrays(self) -> _Columns:
+        """Build (once) the column view of self.trades."""
+        if self._columns is None:
+            self._columns = _build_columns(self._trades)
+        return self._columns
+    
     def evaluate_strategy(
         self,
         strategy_name: str,
@@ -327,20 +690,68 @@ class StrategyEvaluator:
         """
         # Determine date range
         if end_date is None:
-            end_date = datetime.utcnow()
+            end_date = utcnow()
         
         if start_date is None:
             start_date = self._get_period_start(period, end_date)
         
-        # Filter trades
-        strategy_trades = [
-            t for t in self.trades
-            if t.strategy == strategy_name
-            and t.created_at >= start_date
-            and t.created_at <= end_date
-        ]
+        cols = self._ensure_arrays()
+        window = self._window(start_date, end_date)
+        code = cols.strategy_codes.get(strategy_name)
+        if code is None:
+            rows = window[:0]
+        else:
+            rows = window[cols.strategy_idx[window] == code]
+        
+        return self._evaluate_rows(strategy_name, rows, period, start_date, end_date)
+    
+    def compare_strategies(
+        self,
+        period: str = "all_time",
+    ) -> dict[str, StrategyPerformance]:
+        """Compare all strategies over a period."""
+        end_date = utcnow()
+        start_date = self._get_period_start(period, end_date)
+        
+        # Bucket the period's row indices by strategy in one pass; the stable
+        # sort keeps each bucket in original trade order.
+        cols = self._ensure_arrays()
+        window = self._window(start_date, end_date)
+        strategy_idx = cols.strategy_idx[window]
+        order = window[np.argsort(strategy_idx, kind="stable")]
+        counts = np.bincount(strategy_idx, minlength=len(cols.strategy_codes))
+        buckets = np.split(order, np.cumsum(counts)[:-1])
         
-        if not strategy_trades:
+        return {
+            strategy: self._evaluate_rows(strategy, buckets[code], period, start_date, end_date)
+            for strategy, code in cols.strategy_codes.items()
+        }
+    
+    def _window(self, start_date: datetime, end_date: datetime) -> np.ndarray:
+        """Ascending row indices of trades created within [start_date, end_date].
+        
+        Bisects the created-at sort order instead of scanning every trade.
+        """
+        cols = self._ensure_arrays()
+        created = cols.created_sorted
+        lo = int(np.searchsorted(created, _to_us(start_date), side="left"))
+        hi = int(np.searchsorted(created, _to_us(end_date), side="right"))
+        if lo == 0 and hi == created.size:
+            return np.arange(hi)
+        return np.sort(cols.created_order[lo:hi])
+    
+    def _evaluate_rows(
+        self,
+        strategy_name: str,
+        rows: np.ndarray,
+        period: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> StrategyPerformance:
+        """Evaluate one strategy given the row indices of its trades in the period."""
+        cols = self._ensure_arrays()
+        
+        if not rows.size:
             return StrategyPerformance(
                 strategy=strategy_name,
                 period=period,
@@ -349,22 +760,23 @@ class StrategyEvaluator:
             )
         
         # Calculate metrics
-        resolved = [
-            t for t in strategy_trades
-            if t.status in (TradeStatus.RESOLVED_WIN, TradeStatus.RESOLVED_LOSS)
-        ]
-        wins = [t for t in resolved if t.status == TradeStatus.RESOLVED_WIN]
-        losses = [t for t in resolved if t.status == TradeStatus.RESOLVED_LOSS]
+        status = cols.status[rows]
+        resolved_mask = cols.resolved[rows]
+        resolved_rows = rows[resolved_mask]
+        n_resolved = int(resolved_rows.size)
+        n_wins = int(np.count_nonzero(status == _STATUS_WIN))
         
-        total_wagered = sum(t.amount for t in strategy_trades)
-        total_pnl = sum(t.pnl or 0 for t in resolved)
+        total_wagered = float(cols.amount[rows].sum())
+        total_pnl = float(np.dot(resolved_mask, cols.pnl[rows]))
         
         # CLV metrics
-        clv_values = [t.clv for t in resolved if t.clv is not None]
-        avg_clv = mean(clv_values) if clv_values else 0
-        clv_positive = [c for c in clv_values if c > 0]
+        clv_values = cols.clv[resolved_rows]
+        clv_values = clv_values[~np.isnan(clv_values)]
+        avg_clv = float(clv_values.mean()) if clv_values.size else 0
+        clv_positive = int(np.count_nonzero(clv_values > 0))
         
         # By category
+        resolved = [self.trades[i] for i in resolved_rows]
         by_category = self._group_by_field(resolved, "market_category")
         by_platform = self._group_by_field(resolved, "platform")
         
@@ -373,35 +785,24 @@ class StrategyEvaluator:
             period=period,
             start_date=start_date,
             end_date=end_date,
-            total_trades=len(strategy_trades),
-            open_trades=len([t for t in strategy_trades if t.status == TradeStatus.OPEN]),
-            resolved_trades=len(resolved),
-            wins=len(wins),
-            losses=len(losses),
-            win_rate=len(wins) / len(resolved) if resolved else 0,
+            total_trades=int(rows.size),
+            open_trades=int(np.count_nonzero(status == _STATUS_OPEN)),
+            resolved_trades=n_resolved,
+            wins=n_wins,
+            losses=n_resolved - n_wins,
+            win_rate=n_wins / n_resolved if n_resolved else 0,
             total_wagered=total_wagered,
             total_pnl=total_pnl,
             roi=(total_pnl / total_wagered * 100) if total_wagered > 0 else 0,
             avg_clv=avg_clv,
-            clv_positive_count=len(clv_positive),
-            clv_positive_rate=len(clv_positive) / len(clv_values) if clv_values else 0,
-            max_drawdown=self._calculate_max_drawdown(resolved),
+            clv_positive_count=clv_positive,
+            clv_positive_rate=clv_positive / clv_values.size if clv_values.size else 0,
+            max_drawdown=self._calculate_max_drawdown(resolved_rows),
             sharpe_ratio=self._calculate_sharpe(resolved),
             by_category=by_category,
             by_platform=by_platform,
         )
     
-    def compare_strategies(
-        self,
-        period: str = "all_time",
-    ) -> dict[str, StrategyPerformance]:
-        """Compare all strategies over a period."""
-        strategies = set(t.strategy for t in self.trades)
-        return {
-            strategy: self.evaluate_strategy(strategy, period)
-            for strategy in strategies
-        }
-    
     def get_strategy_suggestions(
         self, performance: StrategyPerformance
     ) -> list[str]:
@@ -451,11 +852,9 @@ class StrategyEvaluator:
         
         # Category performance
         if performance.by_category:
-            worst_cat = min(
-                performance.by_category.items(),
-                key=lambda x: x[1].get("roi", 0),
-                default=(None, {})
-            )
+            categories = list(performance.by_category.items())
+            rois = [metrics.get("roi", 0) for _, metrics in categories]
+            worst_cat = categories[rois.index(min(rois))]
             if worst_cat[0] and worst_cat[1].get("roi", 0) < -20:
                 suggestions.append(
                     f"Underperforming in {worst_cat[0]} ({worst_cat[1]['roi']:.0f}% ROI) - "
@@ -482,66 +881,68 @@ class StrategyEvaluator:
         self, trades: list[Trade], field: str
     ) -> dict[str, dict]:
         """Group trade metrics by a field."""
-        groups = defaultdict(list)
+        # Per group: [trades, wins, pnl, wagered, clv_sum, clv_count],
+        # accumulated in a single pass over the trades.
+        groups = {}
         for trade in trades:
             value = getattr(trade, field, None) or "unknown"
-            groups[value].append(trade)
+            acc = groups.get(value)
+            if acc is None:
+                acc = groups[value] = [0, 0, 0, 0, 0.0, 0]
+            acc[0] += 1
+            if trade.status is _WIN:
+                acc[1] += 1
+            if trade.pnl:
+                acc[2] += trade.pnl
+            acc[3] += trade.amount
+            if trade.clv is not None:
+                acc[4] += trade.clv
+                acc[5] += 1
         
         result = {}
-        for group_name, group_trades in groups.items():
-            wins = len([t for t in group_trades if t.status == TradeStatus.RESOLVED_WIN])
-            total_pnl = sum(t.pnl or 0 for t in group_trades)
-            total_wagered = sum(t.amount for t in group_trades)
-            clv_values = [t.clv for t in group_trades if t.clv is not None]
-            
+        for group_name, (count, wins, total_pnl, total_wagered, clv_sum, clv_count) in groups.items():
             result[group_name] = {
-                "trades": len(group_trades),
+                "trades": count,
                 "wins": wins,
-                "win_rate": wins / len(group_trades) if group_trades else 0,
+                "win_rate": wins / count,
                 "pnl": total_pnl,
                 "wagered": total_wagered,
                 "roi": (total_pnl / total_wagered * 100) if total_wagered > 0 else 0,
-                "avg_clv": mean(clv_values) if clv_values else 0,
+                "avg_clv": clv_sum / clv_count if clv_count else 0,
             }
         
         return result
     
-    def _calculate_max_drawdown(self, trades: list[Trade]) -> float:
-        """Calculate maximum drawdown from a series of trades."""
-        if not trades:
+    def _calculate_max_drawdown(self, rows: np.ndarray) -> float:
+        """Calculate maximum drawdown from the trades at the given rows."""
+        if not rows.size:
             return 0
         
-        # Sort by resolution date
-        sorted_trades = sorted(
-            trades,
-            key=lambda t: t.resolution_date or t.created_at
-        )
-        
-        cumulative_pnl = 0
-        peak = 0
-        max_dd = 0
-        
-        for trade in sorted_trades:
-            cumulative_pnl += trade.pnl or 0
-            if cumulative_pnl > peak:
-                peak = cumulative_pnl
-            drawdown = peak - cumulative_pnl
-            if drawdown > max_dd:
-                max_dd = drawdown
-        
-        return max_dd
+        # Sort by resolution date (stable, so ties keep trade order)
+        cols = self._ensure_arrays()
+        order = np.argsort(cols.settled_us[rows], kind="stable")
+        return _max_drawdown(cols.pnl[rows[order]])
     
     def _calculate_sharpe(self, trades: list[Trade]) -> Optional[float]:
         """Calculate Sharpe ratio from trades."""
         if len(trades) < 2:
             return None
         
-        returns = [t.pnl or 0 for t in trades]
-        avg_return = mean(returns)
-        std_return = stdev(returns)
-        
-        if std_return == 0:
-            return None
+        # Identical returns have zero spread; checked exactly since the
+        # floating-point std of equal values need not be exactly 0.
+        if len(trades) < _SMALL_N:
+            returns = array("d")
+            returns.extend(t.pnl or 0.0 for t in trades)
+            if min(returns) == max(returns):
+                return None
+            avg_return, std_return = _mean_std_small(returns)
+        else:
+            returns = np.fromiter(
+                (t.pnl or 0.0 for t in trades), dtype=np.float64, count=len(trades)
+            )
+            if returns.min() == returns.max():
+                return None
+            avg_return, std_return = _mean_std(returns)
         
         # Annualize (assuming ~250 trading days)
         # Simplified: just return risk-adjusted return
@@ -558,7 +959,53 @@ class ParameterTuner:
     def __init__(self, trades: list[Trade] = None):
         """Initialize with trades."""
         self.trades = trades or []
+    
+    @property
+    def trades(self) -> list[Trade]:
+        """Trades under analysis; reassign (don't mutate) to refresh columns."""
+        return self._trades
+    
+    @trades.setter
+    def trades(self, trades: list[Trade]) -> None:
+        self._trades = trades
         self.strategy_evaluator = StrategyEvaluator(trades)
+        self._resolved: Optional[list[Trade]] = None
+        self._strategy_performance: Optional[dict[str, StrategyPerformance]] = None
+        self._calibration: Optional[list[CalibrationPoint]] = None
+        self._resolved_columns: Optional[_ResolvedView] = None
+    
+    def _columns(self) -> _Columns:
+        """Column view of self.trades, shared with the strategy evaluator."""
+        return self.strategy_evaluator._ensure_arrays()
+    
+    def _resolved_view(self) -> _ResolvedView:
+        """Resolved-trade columns, gathered once for all pattern analyses."""
+        if self._resolved_columns is None:
+            cols = self._columns()
+            rows = np.flatnonzero(cols.resolved)
+            clv = cols.clv[rows]
+            self._resolved_columns = _ResolvedView(
+                clv=clv,
+                has_clv=~np.isnan(clv),
+                amount=cols.amount[rows],
+                category=cols.category_idx[rows],
+                expiry_days=cols.expiry_days[rows],
+                has_end=cols.has_end[rows],
+            )
+        return self._resolved_columns
+    
+    def _resolved_trades(self) -> list[Trade]:
+        """Resolved trades of self.trades, filtered once and reused."""
+        if self._resolved is None:
+            trades = self._trades
+            self._resolved = [trades[i] for i in np.flatnonzero(self._columns().resolved)]
+        return self._resolved
+    
+    def _compare_strategies(self) -> dict[str, StrategyPerformance]:
+        """All-time strategy comparison, computed once and reused."""
+        if self._strategy_performance is None:
+            self._strategy_performance = self.strategy_evaluator.compare_strategies()
+        return self._strategy_performance
     
     def suggest_improvements(self) -> list[str]:
         """Analyze all data and suggest actionable improvements.
@@ -572,32 +1019,29 @@ class ParameterTuner:
             improvements.append("Need more trades for meaningful analysis (minimum 5)")
             return improvements
         
-        resolved = [
-            t for t in self.trades
-            if t.status in (TradeStatus.RESOLVED_WIN, TradeStatus.RESOLVED_LOSS)
-        ]
+        resolved = self._resolved_trades()
         
         if not resolved:
             improvements.append("No resolved trades yet - analysis pending")
             return improvements
         
         # 1. Entry price analysis
-        improvements.extend(self._analyze_entry_prices(resolved))
+        improvements.extend(self._analyze_entry_prices())
         
         # 2. Strategy performance
-        improvements.extend(self._analyze_strategy_allocation(resolved))
+        improvements.extend(self._analyze_strategy_allocation())
         
         # 3. Position sizing
-        improvements.extend(self._analyze_position_sizing(resolved))
+        improvements.extend(self._analyze_position_sizing())
         
         # 4. Timing analysis
-        improvements.extend(self._analyze_timing(resolved))
+        improvements.extend(self._analyze_timing())
         
         # 5. Category performance
-        improvements.extend(self._analyze_categories(resolved))
+        improvements.extend(self._analyze_categories())
         
         # 6. CLV patterns
-        improvements.extend(self._analyze_clv_patterns(resolved))
+        improvements.extend(self._analyze_clv_patterns())
         
         return improvements if improvements else ["No specific improvements identified - maintain current approach"]
     
@@ -612,48 +1056,45 @@ class ParameterTuner:
         Returns:
             List of CalibrationPoints for each price bucket
         """
-        trades = trades or self.trades
-        resolved = [
-            t for t in trades
-            if t.status in (TradeStatus.RESOLVED_WIN, TradeStatus.RESOLVED_LOSS)
-        ]
+        if not trades and self._calibration is not None:
+            return list(self._calibration)
         
-        # Define buckets
-        buckets = [
-            (0.00, 0.10),
-            (0.10, 0.20),
-            (0.20, 0.30),
-            (0.30, 0.40),
-            (0.40, 0.50),
-            (0.50, 0.60),
-            (0.60, 0.70),
-            (0.70, 0.80),
-            (0.80, 0.90),
-            (0.90, 1.00),
-        ]
+        if trades:
+            resolved = [
+                t for t in trades
+                if t.status in _RESOLVED_STATUSES
+            ]
+            n = len(resolved)
+            entry = np.fromiter((t.entry_price for t in resolved), dtype=np.float64, count=n)
+            won = np.fromiter(
+                (t.status is _WIN for t in resolved), dtype=np.float64, count=n
+            )
+        else:
+            # Own trades: slice the cached columns instead of re-filtering
+            cols = self._columns()
+            entry = cols.entry_price[cols.resolved]
+            won = (cols.status[cols.resolved] == _STATUS_WIN).astype(np.float64)
+        
+        counts, wins, entry_sums = _calibration_histogram(entry, won, _BUCKET_EDGES)
         
         calibration_points = []
         
-        for bucket_start, bucket_end in buckets:
-            bucket_trades = [
-                t for t in resolved
-                if bucket_start <= t.entry_price < bucket_end
-            ]
-            
-            if not bucket_trades:
+        for i in range(10):
+            count = int(counts[i])
+            if not count:
                 continue
             
-            wins = [t for t in bucket_trades if t.status == TradeStatus.RESOLVED_WIN]
-            avg_entry = mean(t.entry_price for t in bucket_trades)
-            actual_win_rate = len(wins) / len(bucket_trades) if bucket_trades else 0
+            bucket_start, bucket_end = _BUCKET_BOUNDS[i]
+            avg_entry = float(entry_sums[i] / count)
+            actual_win_rate = float(wins[i] / count)
             calibration_error = actual_win_rate - avg_entry
             
             calibration_points.append(CalibrationPoint(
-                price_bucket=f"{bucket_start:.2f}-{bucket_end:.2f}",
+                price_bucket=_BUCKET_LABELS[i],
                 bucket_start=bucket_start,
                 bucket_end=bucket_end,
-                total_trades=len(bucket_trades),
-                resolved_trades=len(bucket_trades),
+                total_trades=count,
+                resolved_trades=count,
                 avg_entry_price=avg_entry,
                 actual_win_rate=actual_win_rate,
                 calibration_error=calibration_error,
@@ -661,6 +1102,9 @@ class ParameterTuner:
                 is_underpriced=calibration_error > 0.05,  # Got value
             ))
         
+        if not trades:
+            self._calibration = calibration_points
+            return list(calibration_points)
         return calibration_points
     
     def get_optimal_parameters(self) -> dict:
@@ -668,35 +1112,35 @@ class ParameterTuner:
         
         Returns dict with suggested parameter values.
         """
-        resolved = [
-            t for t in self.trades
-            if t.status in (TradeStatus.RESOLVED_WIN, TradeStatus.RESOLVED_LOSS)
-        ]
+        resolved = self._resolved_trades()
         
         if len(resolved) < 10:
             return {"status": "insufficient_data", "min_required": 10}
         
         # Find optimal entry price ranges
-        calibration = self.calculate_calibration(resolved)
+        calibration = self.calculate_calibration()
         best_buckets = [
             c for c in calibration
             if c.is_underpriced and c.total_trades >= 3
         ]
         
-        # Analyze position sizing
-        positive_clv_trades = [t for t in resolved if t.clv and t.clv > 0]
-        negative_clv_trades = [t for t in resolved if t.clv and t.clv < 0]
+        # Analyze position sizing (NaN CLVs compare False on both sides)
+        cols = self._columns()
+        winners = cols.resolved & (cols.clv > 0)
+        losers = cols.resolved & (cols.clv < 0)
+        n_winners = int(np.count_nonzero(winners))
+        n_losers = int(np.count_nonzero(losers))
         
-        avg_size_winners = mean(t.amount for t in positive_clv_trades) if positive_clv_trades else 10
-        avg_size_losers = mean(t.amount for t in negative_clv_trades) if negative_clv_trades else 10
+        avg_size_winners = float(np.dot(winners, cols.amount)) / n_winners if n_winners else 10
+        avg_size_losers = float(np.dot(losers, cols.amount)) / n_losers if n_losers else 10
         
         # Strategy allocation
-        strategy_performance = self.strategy_evaluator.compare_strategies()
-        best_strategy = max(
-            strategy_performance.items(),
-            key=lambda x: x[1].avg_clv,
-            default=(None, None)
-        )
+        strategy_performance = self._compare_strategies()
+        best_strategy = (None, None)
+        if strategy_performance:
+            strategies = list(strategy_performance.items())
+            clvs = [perf.avg_clv for _, perf in strategies]
+            best_strategy = strategies[clvs.index(max(clvs))]
         
         return {
             "status": "calculated",
@@ -719,10 +1163,10 @@ class ParameterTuner:
             },
         }
     
-    def _analyze_entry_prices(self, trades: list[Trade]) -> list[str]:
+    def _analyze_entry_prices(self) -> list[str]:
         """Analyze entry price patterns."""
         suggestions = []
-        calibration = self.calculate_calibration(trades)
+        calibration = self.calculate_calibration()
         
         # Find consistently overpriced buckets
         overpriced = [c for c in calibration if c.is_overpriced and c.total_trades >= 3]
@@ -738,11 +1182,11 @@ class ParameterTuner:
         
         return suggestions
     
-    def _analyze_strategy_allocation(self, trades: list[Trade]) -> list[str]:
+    def _analyze_strategy_allocation(self) -> list[str]:
         """Analyze strategy allocation."""
         suggestions = []
         
-        strategy_perf = self.strategy_evaluator.compare_strategies()
+        strategy_perf = self._compare_strategies()
         
         # Find underperforming strategies
         for name, perf in strategy_perf.items():
@@ -757,17 +1201,18 @@ class ParameterTuner:
         
         return suggestions
     
-    def _analyze_position_sizing(self, trades: list[Trade]) -> list[str]:
+    def _analyze_position_sizing(self) -> list[str]:
         """Analyze position sizing patterns."""
         suggestions = []
         
         # Check if larger positions are losing more
-        large_trades = [t for t in trades if t.amount > 30]
-        small_trades = [t for t in trades if t.amount <= 30]
+        view = self._resolved_view()
+        is_large = view.amount > 30
+        n_large = int(np.count_nonzero(is_large))
         
-        if len(large_trades) >= 3 and len(small_trades) >= 3:
-            large_clv = mean(t.clv for t in large_trades if t.clv) if any(t.clv for t in large_trades) else 0
-            small_clv = mean(t.clv for t in small_trades if t.clv) if any(t.clv for t in small_trades) else 0
+        if n_large >= 3 and is_large.size - n_large >= 3:
+            large_clv = _masked_mean(view.clv, is_large & view.has_clv)
+            small_clv = _masked_mean(view.clv, ~is_large & view.has_clv)
             
             if large_clv < small_clv - 3:
                 suggestions.append(
@@ -776,29 +1221,23 @@ class ParameterTuner:
         
         return suggestions
     
-    def _analyze_timing(self, trades: list[Trade]) -> list[str]:
+    def _analyze_timing(self) -> list[str]:
         """Analyze timing patterns."""
         suggestions = []
         
-        # Check CLV by time to expiry (if data available)
-        timed_trades = [
-            t for t in trades
-            if t.market_end_date and t.clv is not None
-        ]
+        # Check CLV by time to expiry (if data available); entries more
+        # than a week out count as early
+        view = self._resolved_view()
+        timed = view.has_end & view.has_clv
         
-        if len(timed_trades) >= 5:
-            early_trades = [
-                t for t in timed_trades
-                if (t.market_end_date - t.created_at).days > 7
-            ]
-            late_trades = [
-                t for t in timed_trades
-                if (t.market_end_date - t.created_at).days <= 7
-            ]
+        if np.count_nonzero(timed) >= 5:
+            is_early = view.expiry_days > 7
+            early = timed & is_early
+            late = timed & ~is_early
             
-            if early_trades and late_trades:
-                early_clv = mean(t.clv for t in early_trades)
-                late_clv = mean(t.clv for t in late_trades)
+            if early.any() and late.any():
+                early_clv = _masked_mean(view.clv, early)
+                late_clv = _masked_mean(view.clv, late)
                 
                 if early_clv > late_clv + 3:
                     suggestions.append(
@@ -811,41 +1250,49 @@ class ParameterTuner:
         
         return suggestions
     
-    def _analyze_categories(self, trades: list[Trade]) -> list[str]:
+    def _analyze_categories(self) -> list[str]:
         """Analyze performance by category."""
         suggestions = []
         
-        categories = defaultdict(list)
-        for trade in trades:
-            cat = trade.market_category or "uncategorized"
-            categories[cat].append(trade)
-        
-        for cat, cat_trades in categories.items():
-            if len(cat_trades) >= 3:
-                clv_values = [t.clv for t in cat_trades if t.clv is not None]
-                if clv_values:
-                    avg_clv = mean(clv_values)
-                    if avg_clv < -5:
-                        suggestions.append(
-                            f"Underperforming in '{cat}' (CLV: {avg_clv:.1f}%) - consider avoiding or reducing"
-                        )
-                    elif avg_clv > 5:
-                        suggestions.append(
-                            f"Strong performance in '{cat}' (CLV: {avg_clv:.1f}%) - lean into this category"
-                        )
+        # Per-category trade counts and CLV sums over resolved trades
+        view = self._resolved_view()
+        names = list(self._columns().category_codes)
+        n_categories = len(names)
+        category, clv, has_clv = view.category, view.clv, view.has_clv
+        counts = np.bincount(category, minlength=n_categories)
+        clv_counts = np.bincount(category[has_clv], minlength=n_categories)
+        clv_sums = np.bincount(category[has_clv], weights=clv[has_clv], minlength=n_categories)
+        
+        # Report categories in the order their first resolved trade appears
+        first_row = np.full(n_categories, category.size)
+        np.minimum.at(first_row, category, np.arange(category.size))
+        present = np.flatnonzero(first_row < category.size)
+        for code in present[np.argsort(first_row[present])].tolist():
+            if counts[code] >= 3 and clv_counts[code]:
+                cat = names[code] or "uncategorized"
+                avg_clv = float(clv_sums[code] / clv_counts[code])
+                if avg_clv < -5:
+                    suggestions.append(
+                        f"Underperforming in '{cat}' (CLV: {avg_clv:.1f}%) - consider avoiding or reducing"
+                    )
+                elif avg_clv > 5:
+                    suggestions.append(
+                        f"Strong performance in '{cat}' (CLV: {avg_clv:.1f}%) - lean into this category"
+                    )
         
         return suggestions
     
-    def _analyze_clv_patterns(self, trades: list[Trade]) -> list[str]:
+    def _analyze_clv_patterns(self) -> list[str]:
         """Analyze overall CLV patterns."""
         suggestions = []
         
-        clv_values = [t.clv for t in trades if t.clv is not None]
-        if not clv_values:
+        view = self._resolved_view()
+        clv_values = view.clv[view.has_clv]
+        if not clv_values.size:
             return suggestions
         
-        avg_clv = mean(clv_values)
-        clv_positive_rate = len([c for c in clv_values if c > 0]) / len(clv_values)
+        avg_clv = float(clv_values.mean())
+        clv_positive_rate = np.count_nonzero(clv_values > 0) / clv_values.size
         
         if avg_clv < 0:
             suggestions.append(
@@ -873,27 +1320,32 @@ def analyze_and_improve(trades: list[Trade]) -> dict:
     Returns:
         Dict with performance metrics, calibration, and improvements
     """
-    evaluator = StrategyEvaluator(trades)
     tuner = ParameterTuner(trades)
-    analyzer = ResolutionAnalyzer(trades)
     
-    resolved = [
-        t for t in trades
-        if t.status in (TradeStatus.RESOLVED_WIN, TradeStatus.RESOLVED_LOSS)
-    ]
+    # The tuner's columns, resolved list and comparison are shared with the
+    # analyzer and the report so each is only computed once.
+    cols = tuner._columns()
+    analyzer = ResolutionAnalyzer(trades, columns=cols)
+    resolved = tuner._resolved_trades()
+    # Every summary count comes from one pass over the status codes
+    status_counts = np.bincount(cols.status, minlength=len(TradeStatus))
     
     return {
         "summary": {
             "total_trades": len(trades),
-            "resolved": len(resolved),
-            "open": len([t for t in trades if t.status == TradeStatus.OPEN]),
+            "resolved": int(status_counts[_STATUS_WIN] + status_counts[_STATUS_LOSS]),
+            "open": int(status_counts[_STATUS_OPEN]),
         },
-        "strategy_performance": evaluator.compare_strategies(),
+        "strategy_performance": tuner._compare_strategies(),
         "calibration": tuner.calculate_calibration(),
         "improvements": tuner.suggest_improvements(),
         "optimal_parameters": tuner.get_optimal_parameters(),
         "recent_lessons": [
             analyzer.generate_lesson_summary(t)
-            for t in sorted(resolved, key=lambda x: x.resolution_date or x.created_at, reverse=True)[:5]
+            for _, t in heapq.nlargest(
+                5,
+                ((t.resolution_date or t.created_at, t) for t in resolved),
+                key=itemgetter(0),
+            )
         ],
     }
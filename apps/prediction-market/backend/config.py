@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     db_path: Path = Field(
         default=Path(__file__).parent.parent / "data" / "trades.db"
     )
+    db_echo: bool = False  # Log every SQL statement (local debugging only)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
     
     # Logging
     log_path: Path = Field(
@@ -39,9 +42,7 @@ class Settings(BaseSettings):
     # Strategy defaults
     default_strategies: list[str] = ["nothing_ever_happens", "yield_farming"]
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 
 settings = Settings()
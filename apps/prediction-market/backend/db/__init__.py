@@ -1,3 +1,3 @@
 """Database layer."""
-from .database import get_db, init_db, AsyncSessionLocal
-__all__ = ["get_db", "init_db", "AsyncSessionLocal"]
+from .database import get_db, init_db, bulk_create_trades, AsyncSessionLocal
+__all__ = ["get_db", "init_db", "bulk_create_trades", "AsyncSessionLocal"]
@@ -1,20 +1,60 @@
 """Database setup and session management."""
 
+import hashlib
+import uuid
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
+import orjson
+from sqlalchemy import event, insert, inspect, select, update, bindparam
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from ..config import settings
-from ..models.trade import Base as TradeBase
+from ..models.trade import (
+    Base as TradeBase, TradeCreate, TradeDB, days_to_expiry, new_trade_values, utcnow,
+)
 from ..models.market import Base as MarketBase
 
 
 # Ensure data directory exists
 settings.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-# Create async engine
+# Create async engine. Connections are pooled so requests reuse an open
+# SQLite connection (and its pragmas) instead of reopening the file; SQL
+# echo has its own switch so debug mode doesn't log every statement.
 DATABASE_URL = f"sqlite+aiosqlite:///{settings.db_path}"
-engine = create_async_engine(DATABASE_URL, echo=settings.debug)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=settings.db_echo,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=False,
+    connect_args={"check_same_thread": False},
+    # JSON columns (entry_context) are encoded/decoded with orjson
+    json_serializer=lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode(),
+    json_deserializer=orjson.loads,
+)
+
+# Per-connection SQLite tuning: WAL lets readers run alongside the writer,
+# NORMAL sync is durable under WAL, and a larger page cache / mmap window
+# keeps the trades table in memory.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
 
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -29,6 +69,89 @@ async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(TradeBase.metadata.create_all)
         await conn.run_sync(MarketBase.metadata.create_all)
+        await conn.run_sync(_migrate_trades)
+        # create_all skips indexes on tables that already exist
+        for index in TradeDB.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
+
+
+def schema_fingerprint() -> str:
+    """Hash of the database location and the tables, columns and indexes init_db creates."""
+    parts = [DATABASE_URL]
+    for metadata in (TradeBase.metadata, MarketBase.metadata):
+        for table in metadata.sorted_tables:
+            parts.append(table.name)
+            parts.extend(f"{table.name}.{column.name}" for column in table.columns)
+            parts.extend(sorted(f"{table.name}:{index.name}" for index in table.indexes))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+async def init_db_once(marker: Path) -> bool:
+    """Run init_db unless marker shows it already ran for this schema.
+    
+    For short-lived scripts (cron jobs) that would otherwise inspect the
+    schema on every run. Returns whether init_db ran.
+    """
+    fingerprint = schema_fingerprint()
+    try:
+        if settings.db_path.exists() and marker.read_text() == fingerprint:
+            return False
+    except FileNotFoundError:
+        pass
+    
+    await init_db()
+    marker.write_text(fingerprint)
+    return True
+
+
+def _migrate_trades(conn) -> None:
+    """Add trade columns introduced after the table was first created."""
+    columns = {column["name"] for column in inspect(conn).get_columns("trades")}
+    if "days_to_expiry_at_entry" in columns:
+        return
+    
+    conn.exec_driver_sql("ALTER TABLE trades ADD COLUMN days_to_expiry_at_entry INTEGER")
+    
+    # Backfill existing trades from their stored dates
+    table = TradeDB.__table__
+    rows = conn.execute(
+        select(table.c.id, table.c.created_at, table.c.market_end_date)
+        .where(table.c.market_end_date.is_not(None))
+    ).all()
+    if rows:
+        conn.execute(
+            update(table)
+            .where(table.c.id == bindparam("trade_id"))
+            .values(days_to_expiry_at_entry=bindparam("days")),
+            [
+                {"trade_id": trade_id, "days": days_to_expiry(created_at, end_date)}
+                for trade_id, created_at, end_date in rows
+            ],
+        )
+
+
+# Rows per INSERT executemany; large backfills are split into chunks of
+# this size, all inside one transaction.
+BULK_INSERT_CHUNK_SIZE = 10_000
+
+
+async def bulk_create_trades(
+    session: AsyncSession,
+    trades: list[TradeCreate],
+    now: Optional[datetime] = None,
+) -> list[dict]:
+    """Insert new trades with Core executemany and commit once.
+    
+    Bypasses per-object ORM flushes, which dominate when logging many
+    trades. Returns the inserted column values in input order.
+    """
+    now = now or utcnow()
+    rows = [new_trade_values(trade, str(uuid.uuid4()), now) for trade in trades]
+    stmt = insert(TradeDB)
+    for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+        await session.execute(stmt, rows[start:start + BULK_INSERT_CHUNK_SIZE])
+    await session.commit()
+    return rows
 
 
 async def get_db():
@@ -1,25 +1,28 @@
 """Prediction Market Agent - FastAPI Backend."""
 
-import json
 import uuid
-from datetime import datetime
+from collections import defaultdict
 from pathlib import Path
 from typing import Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, case, null
 
 from .config import settings
-from .db.database import get_db, init_db, AsyncSessionLocal
-from .models.trade import Trade, TradeCreate, TradeUpdate, TradeDB, TradeStatus
+from .db.database import get_db, init_db, bulk_create_trades, AsyncSessionLocal
+from .models.trade import (
+    Trade, TradeCreate, TradeUpdate, TradeResolution, TradeDB, TradeStatus,
+    TRADE_LIST_ADAPTER, new_trade_values, utcnow,
+)
 from .models.market import Market, MarketOpportunity
 from .models.performance import StrategyPerformance, OverallPerformance
 from .strategies import NothingEverHappensStrategy, YieldFarmingStrategy
+from .trade_log import trade_log
 from .trading import trading_engine, Position, ExposureReport, RiskCheckResult, TradeResult
 
 
@@ -29,13 +32,27 @@ STRATEGIES = {
     "yield_farming": YieldFarmingStrategy,
 }
 
+# Shared default-config instances; strategies hold no per-request state
+STRATEGY_INSTANCES = {name: cls() for name, cls in STRATEGIES.items()}
+
+# Strategy performance cache: (strategy, period) -> (version, stamp, metrics).
+# Writes through this API bump the strategy's version; the stamp
+# (MAX(updated_at), COUNT(*)) catches writes made elsewhere, e.g. the paper
+# trader or the resolution script.
+_performance_cache: dict[tuple[str, str], tuple[int, tuple, dict]] = {}
+_strategy_versions: defaultdict[str, int] = defaultdict(int)
+
+_NO_TRADES = {"trades": 0, "message": "No trades found"}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize on startup."""
     await init_db()
     settings.log_path.mkdir(parents=True, exist_ok=True)
+    await trade_log.start()
     yield
+    await trade_log.stop()
 
 
 app = FastAPI(
@@ -61,44 +78,43 @@ app.add_middleware(
 async def create_trade(trade: TradeCreate, db: AsyncSession = Depends(get_db)):
     """Log a new trade."""
     trade_id = str(uuid.uuid4())
-    now = datetime.utcnow()
-    
-    # Calculate shares
-    shares = trade.amount / trade.entry_price if trade.entry_price > 0 else 0
-    
-    db_trade = TradeDB(
-        id=trade_id,
-        created_at=now,
-        updated_at=now,
-        platform=trade.platform,
-        market_id=trade.market_id,
-        market_question=trade.market_question,
-        market_category=trade.market_category,
-        market_end_date=trade.market_end_date,
-        side=trade.side.value,
-        entry_price=trade.entry_price,
-        amount=trade.amount,
-        shares=shares,
-        strategy=trade.strategy,
-        entry_context=json.dumps(trade.entry_context) if trade.entry_context else None,
-        status=TradeStatus.OPEN.value,
-    )
+    now = utcnow()
+    
+    db_trade = TradeDB(**new_trade_values(trade, trade_id, now))
     
     db.add(db_trade)
     await db.commit()
-    await db.refresh(db_trade)
+    _strategy_versions[db_trade.strategy] += 1
     
     # Append to JSONL log
     log_entry = {
-        "timestamp": now.isoformat(),
+        "timestamp": now,
         "action": "trade_created",
         "trade_id": trade_id,
-        "data": trade.model_dump(mode="json"),
+        "data": trade.model_dump(),
     }
-    with open(settings.trade_log_path, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+    trade_log.write(log_entry)
     
-    return _db_to_trade(db_trade)
+    return Trade.model_validate(db_trade)
+
+
+@app.post("/api/trades/batch", response_model=list[Trade])
+async def create_trades(trades: list[TradeCreate], db: AsyncSession = Depends(get_db)):
+    """Log many trades at once (e.g. a historical backfill)."""
+    now = utcnow()
+    rows = await bulk_create_trades(db, trades, now)
+    
+    for strategy in {row["strategy"] for row in rows}:
+        _strategy_versions[strategy] += 1
+    for trade, row in zip(trades, rows):
+        trade_log.write({
+            "timestamp": now,
+            "action": "trade_created",
+            "trade_id": row["id"],
+            "data": trade.model_dump(),
+        })
+    
+    return TRADE_LIST_ADAPTER.validate_python(rows)
 
 
 @app.get("/api/trades", response_model=list[Trade])
@@ -110,21 +126,39 @@ async def list_trades(
     offset: int = 0,
     db: AsyncSession = Depends(get_db),
 ):
-    """List trades with optional filters."""
-    query = select(TradeDB).order_by(TradeDB.created_at.desc())
-    
+    """List trades with optional filters.
+    
+    The total number of matching trades is returned in X-Total-Count.
+    The page is serialized in one pass by a list adapter; response_model
+    only documents the schema.
+    """
+    # The windowed count rides along with the page, so totals need no
+    # second query unless the page is empty.
+    query = select(TradeDB, func.count().over()).order_by(TradeDB.created_at.desc())
+    filters = []
     if status:
-        query = query.where(TradeDB.status == status)
+        filters.append(TradeDB.status == status)
     if strategy:
-        query = query.where(TradeDB.strategy == strategy)
+        filters.append(TradeDB.strategy == strategy)
     if platform:
-        query = query.where(TradeDB.platform == platform)
+        filters.append(TradeDB.platform == platform)
+    query = query.where(*filters)
     
     query = query.offset(offset).limit(limit)
     result = await db.execute(query)
-    trades = result.scalars().all()
+    rows = result.all()
+    
+    if rows:
+        total = rows[0][1]
+    else:
+        total = await db.scalar(select(func.count()).select_from(TradeDB).where(*filters))
     
-    return [_db_to_trade(t) for t in trades]
+    trades = TRADE_LIST_ADAPTER.validate_python([t for t, _ in rows])
+    return Response(
+        content=TRADE_LIST_ADAPTER.dump_json(trades),
+        media_type="application/json",
+        headers={"X-Total-Count": str(total)},
+    )
 
 
 @app.get("/api/trades/{trade_id}", response_model=Trade)
@@ -134,7 +168,7 @@ async def get_trade(trade_id: str, db: AsyncSession = Depends(get_db)):
     trade = result.scalar_one_or_none()
     if not trade:
         raise HTTPException(status_code=404, detail="Trade not found")
-    return _db_to_trade(trade)
+    return Trade.model_validate(trade)
 
 
 @app.put("/api/trades/{trade_id}", response_model=Trade)
@@ -158,26 +192,106 @@ async def update_trade(
         trade.pnl = _calculate_pnl(trade, update.resolution_outcome)
         trade.roi = (trade.pnl / trade.amount) * 100 if trade.amount > 0 else 0
     
-    # Calculate CLV if closing price provided
-    if update.closing_price and trade.clv is None:
+    # Calculate CLV if closing price provided (0.0 is a valid price)
+    if update.closing_price is not None and trade.clv is None:
         trade.clv = trade.entry_price - update.closing_price
         trade.was_good_trade = trade.clv > 0
     
-    trade.updated_at = datetime.utcnow()
+    now = utcnow()
+    trade.updated_at = now
     await db.commit()
-    await db.refresh(trade)
+    _strategy_versions[trade.strategy] += 1
     
     # Log update
     log_entry = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": now,
         "action": "trade_updated",
         "trade_id": trade_id,
         "data": update_data,
     }
-    with open(settings.trade_log_path, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
+    trade_log.write(log_entry)
+    
+    return Trade.model_validate(trade)
+
+
+@app.post("/api/trades/resolve-batch", response_model=list[Trade])
+async def resolve_trades(
+    resolutions: dict[str, TradeResolution],
+    db: AsyncSession = Depends(get_db),
+):
+    """Resolve many trades (trade_id -> resolution) in one UPDATE.
+    
+    Status, P&L, ROI and CLV follow the same rules as update_trade, but are
+    computed by SQL CASE expressions so the whole batch settles in a single
+    statement and transaction. Fails with 404 if any trade is missing.
+    """
+    if not resolutions:
+        return []
+    
+    now = utcnow()
+    outcome = case(
+        {trade_id: r.outcome.value for trade_id, r in resolutions.items()},
+        value=TradeDB.id,
+    )
+    closing_prices = {
+        trade_id: r.closing_price
+        for trade_id, r in resolutions.items()
+        if r.closing_price is not None
+    }
+    closing = case(closing_prices, value=TradeDB.id, else_=None) if closing_prices else null()
+    won = TradeDB.side == outcome
+    
+    # SET expressions all see the pre-update row, so existing P&L and CLV
+    # are kept and only missing values are filled in
+    pnl = case(
+        (TradeDB.pnl.is_not(None), TradeDB.pnl),
+        (won, case((func.coalesce(TradeDB.shares, 0) != 0, TradeDB.shares - TradeDB.amount), else_=0.0)),
+        else_=-TradeDB.amount,
+    )
+    clv = TradeDB.entry_price - closing
+    stmt = (
+        update(TradeDB)
+        .where(TradeDB.id.in_(list(resolutions)))
+        .values(
+            status=case((won, TradeStatus.RESOLVED_WIN.value), else_=TradeStatus.RESOLVED_LOSS.value),
+            resolution_outcome=outcome,
+            resolution_date=now,
+            closing_price=func.coalesce(closing, TradeDB.closing_price),
+            pnl=pnl,
+            roi=case(
+                (TradeDB.pnl.is_not(None), TradeDB.roi),
+                (TradeDB.amount > 0, (pnl / TradeDB.amount) * 100),
+                else_=0.0,
+            ),
+            clv=case((TradeDB.clv.is_not(None), TradeDB.clv), else_=clv),
+            was_good_trade=case(
+                (TradeDB.clv.is_not(None) | closing.is_(None), TradeDB.was_good_trade),
+                else_=clv > 0,
+            ),
+            updated_at=now,
+        )
+        .returning(TradeDB)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    trades = (await db.execute(stmt)).scalars().all()
+    
+    missing = resolutions.keys() - {t.id for t in trades}
+    if missing:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail=f"Trades not found: {sorted(missing)}")
+    await db.commit()
     
-    return _db_to_trade(trade)
+    for strategy in {t.strategy for t in trades}:
+        _strategy_versions[strategy] += 1
+    for trade_id, resolution in resolutions.items():
+        trade_log.write({
+            "timestamp": now,
+            "action": "trade_resolved",
+            "trade_id": trade_id,
+            "data": resolution.model_dump(),
+        })
+    
+    return TRADE_LIST_ADAPTER.validate_python(trades)
 
 
 # ============== STRATEGIES API ==============
@@ -186,8 +300,7 @@ async def update_trade(
 async def list_strategies():
     """List available strategies."""
     result = []
-    for name, strategy_cls in STRATEGIES.items():
-        strategy = strategy_cls()
+    for name, strategy in STRATEGY_INSTANCES.items():
         result.append({
             "name": name,
             "description": strategy.description,
@@ -202,7 +315,7 @@ async def get_strategy(name: str, db: AsyncSession = Depends(get_db)):
     if name not in STRATEGIES:
         raise HTTPException(status_code=404, detail="Strategy not found")
     
-    strategy = STRATEGIES[name]()
+    strategy = STRATEGY_INSTANCES[name]
     performance = await _get_strategy_performance(db, name)
     
     return {
@@ -219,7 +332,7 @@ async def scan_with_strategy(name: str, markets: list[Market]):
     if name not in STRATEGIES:
         raise HTTPException(status_code=404, detail="Strategy not found")
     
-    strategy = STRATEGIES[name]()
+    strategy = STRATEGY_INSTANCES[name]
     opportunities = await strategy.scan_markets(markets)
     return opportunities
 
@@ -297,6 +410,20 @@ async def execute_opportunity(
     return result
 
 
+@app.post("/api/trading/execute-batch", response_model=list[TradeResult])
+async def execute_opportunities(
+    opportunities: list[MarketOpportunity],
+    force: bool = Query(default=False, description="Skip risk checks (use with caution!)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Execute several opportunities in order, each checked against the ones before it."""
+    return await trading_engine.execute_opportunities(
+        opportunities=opportunities,
+        db=db,
+        force=force,
+    )
+
+
 @app.post("/api/trading/check-risk", response_model=RiskCheckResult)
 async def check_risk_limits(
     opportunity: MarketOpportunity,
@@ -320,44 +447,13 @@ async def get_exposure(db: AsyncSession = Depends(get_db)):
 
 # ============== HELPERS ==============
 
-def _db_to_trade(db_trade: TradeDB) -> Trade:
-    """Convert DB model to Pydantic model."""
-    return Trade(
-        id=db_trade.id,
-        created_at=db_trade.created_at,
-        updated_at=db_trade.updated_at,
-        platform=db_trade.platform,
-        market_id=db_trade.market_id,
-        market_question=db_trade.market_question,
-        market_category=db_trade.market_category,
-        market_end_date=db_trade.market_end_date,
-        side=db_trade.side,
-        entry_price=db_trade.entry_price,
-        amount=db_trade.amount,
-        shares=db_trade.shares,
-        strategy=db_trade.strategy,
-        entry_context=json.loads(db_trade.entry_context) if db_trade.entry_context else None,
-        status=db_trade.status,
-        resolution_date=db_trade.resolution_date,
-        resolution_outcome=db_trade.resolution_outcome,
-        closing_price=db_trade.closing_price,
-        pnl=db_trade.pnl,
-        roi=db_trade.roi,
-        clv=db_trade.clv,
-        was_good_trade=db_trade.was_good_trade,
-        lessons=db_trade.lessons,
-        quality_rating=db_trade.quality_rating,
-    )
+# (side, outcome) pairs that win: YES on a YES outcome, NO on a NO outcome
+_WINNING_RESOLUTIONS = frozenset({("yes", "yes"), ("no", "no")})
 
 
 def _calculate_pnl(trade: TradeDB, outcome: str) -> float:
     """Calculate profit/loss for a trade."""
-    # If we bet YES and outcome is YES, we win
-    # If we bet NO and outcome is NO, we win
-    won = (trade.side == "yes" and outcome == "yes") or \
-          (trade.side == "no" and outcome == "no")
-    
-    if won:
+    if (trade.side, outcome) in _WINNING_RESOLUTIONS:
         # Win: shares * $1 - amount_paid
         return trade.shares - trade.amount if trade.shares else 0
     else:
@@ -370,47 +466,94 @@ async def _get_strategy_performance(
     strategy: str,
     period: str = "all_time"
 ) -> dict:
-    """Calculate performance metrics for a strategy."""
-    query = select(TradeDB).where(TradeDB.strategy == strategy)
-    result = await db.execute(query)
-    trades = result.scalars().all()
-    
-    if not trades:
-        return {"trades": 0, "message": "No trades found"}
+    """Performance metrics for a strategy, cached until its trades change."""
+    key = (strategy, period)
+    version = _strategy_versions[strategy]
+    result = await db.execute(
+        select(func.max(TradeDB.updated_at), func.count())
+        .where(TradeDB.strategy == strategy)
+    )
+    stamp = tuple(result.one())
     
-    open_trades = [t for t in trades if t.status == TradeStatus.OPEN.value]
-    resolved = [t for t in trades if t.status != TradeStatus.OPEN.value]
-    wins = [t for t in resolved if t.status == TradeStatus.RESOLVED_WIN.value]
+    cached = _performance_cache.get(key)
+    if cached is not None and cached[0] == version and cached[1] == stamp:
+        return dict(cached[2])
     
-    total_wagered = sum(t.amount for t in trades)
-    total_pnl = sum(t.pnl or 0 for t in resolved)
+    performance = await _calculate_strategy_performance(db, strategy, period)
+    _performance_cache[key] = (version, stamp, performance)
+    return dict(performance)
+
+
+async def _calculate_strategy_performance(
+    db: AsyncSession,
+    strategy: str,
+    period: str = "all_time"
+) -> dict:
+    """Calculate performance metrics for a strategy."""
+    # Aggregate per status in SQLite rather than loading every trade
+    query = (
+        select(
+            TradeDB.status,
+            func.count(),
+            func.sum(TradeDB.amount),
+            func.sum(TradeDB.pnl),
+            func.sum(TradeDB.clv),
+            func.count(TradeDB.clv),
+            func.sum(case((TradeDB.clv > 0, 1), else_=0)),
+        )
+        .where(TradeDB.strategy == strategy)
+        .group_by(TradeDB.status)
+    )
+    result = await db.execute(query)
     
-    clv_trades = [t for t in resolved if t.clv is not None]
-    avg_clv = sum(t.clv for t in clv_trades) / len(clv_trades) if clv_trades else 0
-    clv_positive = len([t for t in clv_trades if t.clv > 0])
+    total_trades = open_trades = resolved = wins = 0
+    total_wagered = total_pnl = clv_sum = 0
+    clv_count = clv_positive = 0
+    for status, count, amount_sum, pnl_sum, status_clv_sum, status_clv_count, status_clv_positive in result:
+        total_trades += count
+        total_wagered += amount_sum or 0
+        if status == TradeStatus.OPEN.value:
+            open_trades += count
+            continue
+        resolved += count
+        if status == TradeStatus.RESOLVED_WIN.value:
+            wins += count
+        total_pnl += pnl_sum or 0
+        clv_sum += status_clv_sum or 0
+        clv_count += status_clv_count
+        clv_positive += status_clv_positive
+    
+    if not total_trades:
+        return dict(_NO_TRADES)
+    
+    avg_clv = clv_sum / clv_count if clv_count else 0
     
     return {
         "strategy": strategy,
         "period": period,
-        "total_trades": len(trades),
-        "open_trades": len(open_trades),
-        "resolved_trades": len(resolved),
-        "wins": len(wins),
-        "losses": len(resolved) - len(wins),
-        "win_rate": len(wins) / len(resolved) if resolved else 0,
+        "total_trades": total_trades,
+        "open_trades": open_trades,
+        "resolved_trades": resolved,
+        "wins": wins,
+        "losses": resolved - wins,
+        "win_rate": wins / resolved if resolved else 0,
         "total_wagered": total_wagered,
         "total_pnl": total_pnl,
         "roi": (total_pnl / total_wagered * 100) if total_wagered > 0 else 0,
         "avg_clv": avg_clv,
-        "clv_positive_rate": clv_positive / len(clv_trades) if clv_trades else 0,
+        "clv_positive_rate": clv_positive / clv_count if clv_count else 0,
     }
 
 
 async def _calculate_overall_performance(db: AsyncSession, period: str) -> dict:
     """Calculate overall performance across all strategies."""
-    strategies = {}
-    for name in STRATEGIES.keys():
-        strategies[name] = await _get_strategy_performance(db, name, period)
+    # One probe instead of a query per strategy while no trades exist yet
+    if await db.scalar(select(TradeDB.id).limit(1)) is None:
+        strategies = {name: dict(_NO_TRADES) for name in STRATEGIES}
+    else:
+        strategies = {}
+        for name in STRATEGIES.keys():
+            strategies[name] = await _get_strategy_performance(db, name, period)
     
     all_trades = sum(s.get("total_trades", 0) for s in strategies.values())
     total_wagered = sum(s.get("total_wagered", 0) for s in strategies.values())
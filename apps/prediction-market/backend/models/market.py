@@ -1,10 +1,11 @@
 """Market model - represents a prediction market."""
 
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import Column, String, Float, DateTime, Text, Boolean
-from .trade import Base
+from .trade import Base, utcnow
 
 
 class MarketDB(Base):
@@ -39,8 +40,8 @@ class MarketDB(Base):
     resolution_date = Column(DateTime, nullable=True)
     
     # Timestamps
-    first_seen = Column(DateTime, default=datetime.utcnow)
-    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    first_seen = Column(DateTime, default=utcnow)
+    last_updated = Column(DateTime, default=utcnow, onupdate=utcnow)
 
 
 # Pydantic models
@@ -78,8 +79,16 @@ class Market(MarketBase):
     first_seen: datetime
     last_updated: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @cached_property
+    def question_lower(self) -> str:
+        """Lowercased question, computed once and shared by all strategies.
+        
+        Cached on first use, so don't change question afterwards (or
+        model_copy with a new question).
+        """
+        return self.question.lower()
 
 
 class MarketOpportunity(BaseModel):
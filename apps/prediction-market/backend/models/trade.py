@@ -1,10 +1,12 @@
 """Trade model - core data structure for logging trades."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, Field
-from sqlalchemy import Column, String, Float, DateTime, Text, Enum as SQLEnum, Boolean
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from sqlalchemy import Column, String, Float, DateTime, Text, Enum as SQLEnum, Boolean, Index, Integer, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -24,14 +26,46 @@ class TradeSide(str, Enum):
     NO = "no"
 
 
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime, like the stored timestamps."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare with aware ones."""
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def days_to_expiry(created_at: datetime, market_end_date: Optional[datetime]) -> Optional[int]:
+    """Whole days (floored) from trade entry to market end, None if no end date."""
+    if market_end_date is None:
+        return None
+    return (_as_utc(market_end_date) - _as_utc(created_at)).days
+
+
 class TradeDB(Base):
     """SQLAlchemy model for trades."""
     
     __tablename__ = "trades"
+    __table_args__ = (
+        # Filtered listings ordered by created_at (see list_trades)
+        Index("ix_trades_status_created", "status", "created_at"),
+        Index("ix_trades_strategy_created", "strategy", "created_at"),
+        Index("ix_trades_platform_created", "platform", "created_at"),
+        # Per-strategy status aggregation (see _calculate_strategy_performance)
+        Index("ix_trades_strategy_status", "strategy", "status"),
+        # Cache freshness probe (MAX(updated_at), COUNT(*) per strategy),
+        # answered from the index alone (see _get_strategy_performance)
+        Index("ix_trades_strategy_updated", "strategy", "updated_at"),
+        # Volume opened since a given time (see PositionManager)
+        Index("ix_trades_created", "created_at"),
+        # Looking up our (open) trades in a given market
+        Index("ix_trades_market_status", "market_id", "platform", "status"),
+    )
     
     id = Column(String, primary_key=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
     
     # Platform & Market
     platform = Column(String, nullable=False)  # polymarket, kalshi, limitless
@@ -39,6 +73,7 @@ class TradeDB(Base):
     market_question = Column(Text, nullable=False)
     market_category = Column(String, nullable=True)
     market_end_date = Column(DateTime, nullable=True)
+    days_to_expiry_at_entry = Column(Integer, nullable=True)  # Whole days from entry to market end
     
     # Trade details
     side = Column(String, nullable=False)  # yes, no
@@ -48,7 +83,10 @@ class TradeDB(Base):
     
     # Strategy
     strategy = Column(String, nullable=False)
-    entry_context = Column(Text, nullable=True)  # JSON string of context
+    entry_context = Column(  # Context dict, stored as native JSON
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
     
     # Status & Resolution
     status = Column(String, default=TradeStatus.OPEN)
@@ -101,11 +139,18 @@ class TradeUpdate(BaseModel):
     quality_rating: Optional[float] = None
 
 
+class TradeResolution(BaseModel):
+    """Resolution of one trade in a batch settlement."""
+    outcome: TradeSide
+    closing_price: Optional[float] = None
+
+
 class Trade(TradeBase):
     """Full trade model with all fields."""
     id: str
     created_at: datetime
     updated_at: datetime
+    days_to_expiry_at_entry: Optional[int] = None
     shares: Optional[float] = None
     status: TradeStatus = TradeStatus.OPEN
     resolution_date: Optional[datetime] = None
@@ -118,5 +163,31 @@ class Trade(TradeBase):
     lessons: Optional[str] = None
     quality_rating: Optional[float] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Validates or serializes a whole list of trades in one pydantic-core call
+TRADE_LIST_ADAPTER = TypeAdapter(list[Trade])
+
+
+def new_trade_values(trade: TradeCreate, trade_id: str, now: datetime) -> dict:
+    """Column values for a newly logged (open) trade."""
+    return {
+        "id": trade_id,
+        "created_at": now,
+        "updated_at": now,
+        "platform": trade.platform,
+        "market_id": trade.market_id,
+        "market_question": trade.market_question,
+        "market_category": trade.market_category,
+        "market_end_date": trade.market_end_date,
+        "days_to_expiry_at_entry": days_to_expiry(now, trade.market_end_date),
+        "side": trade.side.value,
+        "entry_price": trade.entry_price,
+        "amount": trade.amount,
+        # Calculate shares
+        "shares": trade.amount / trade.entry_price if trade.entry_price > 0 else 0,
+        "strategy": trade.strategy,
+        "entry_context": trade.entry_context or None,
+        "status": TradeStatus.OPEN.value,
+    }
@@ -5,14 +5,40 @@ Uses:
 - CLOB API (https://clob.polymarket.com) for orderbook and prices
 """
 
-import json
+import asyncio
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, ClassVar, Optional
 
 import httpx
+import numpy as np
+import orjson
 
 from ..models.market import Market
+from ..models.trade import utcnow
+
+try:
+    import h2  # noqa: F401  (httpx's optional HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Gamma ISO timestamp ("...Z" allowed), None if missing or invalid.
+    
+    Cached because many markets share the same timestamps.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except (ValueError, TypeError):
+        return None
 
 
 class PolymarketAdapter:
@@ -22,6 +48,24 @@ class PolymarketAdapter:
     CLOB_BASE_URL = "https://clob.polymarket.com"
     PLATFORM_NAME = "polymarket"
     
+    # Sized for many strategies fetching markets, prices and books at once
+    HTTP_LIMITS = httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=40,
+        keepalive_expiry=30.0,
+    )
+    
+    # One client per timeout, shared by every adapter in the process so
+    # connections (and, with HTTP/2, multiplexed streams) are reused. The
+    # client is closed when the last adapter using it closes.
+    _clients: ClassVar[dict[float, httpx.AsyncClient]] = {}
+    _client_users: ClassVar[dict[float, int]] = {}
+    
+    # Raw Gamma market payloads are reused for this long (seconds), which
+    # keeps prices fresh while collapsing repeated lookups during a scan
+    MARKET_CACHE_TTL = 5.0
+    MARKET_CACHE_SIZE = 1024
+    
     def __init__(self, timeout: float = 30.0):
         """Initialize the adapter.
         
@@ -29,23 +73,61 @@ class PolymarketAdapter:
             timeout: HTTP request timeout in seconds
         """
         self.timeout = timeout
-        self._client: Optional[httpx.AsyncClient] = None
+        self._holds_client = False
         
-        # Paper trading state (in-memory for now)
+        # market_id -> (expires_at, raw payload), least recently used first
+        self._raw_market_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        
+        # Paper trading state (in-memory for now). Positions are stored as
+        # columns: row i of the share/cost/avg-price arrays belongs to
+        # _position_keys[i] = (position_id, market_id, side).
         self._paper_orders: dict[str, dict] = {}
-        self._paper_positions: dict[str, dict] = {}
+        self._position_rows: dict[str, int] = {}
+        self._position_keys: list[tuple[str, str, str]] = []
+        self._position_shares = np.zeros(16)
+        self._position_cost = np.zeros(16)
+        self._position_avg_price = np.zeros(16)
     
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create the HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
-        return self._client
+        """Get or create the shared HTTP client."""
+        # No awaits below, so concurrent callers can't race to create it
+        if not self._holds_client:
+            self._holds_client = True
+            self._client_users[self.timeout] = self._client_users.get(self.timeout, 0) + 1
+        client = self._clients.get(self.timeout)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.HTTP_LIMITS,
+                http2=HTTP2_AVAILABLE,
+            )
+            self._clients[self.timeout] = client
+        return client
     
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+        """Release the shared HTTP client, closing it if no other adapter uses it."""
+        if not self._holds_client:
+            return
+        self._holds_client = False
+        # (Counts are gone if shutdown() already closed everything)
+        users = self._client_users.get(self.timeout, 0) - 1
+        if users > 0:
+            self._client_users[self.timeout] = users
+            return
+        self._client_users.pop(self.timeout, None)
+        client = self._clients.pop(self.timeout, None)
+        if client and not client.is_closed:
+            await client.aclose()
+    
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close every shared HTTP client, e.g. on application shutdown."""
+        clients = list(cls._clients.values())
+        cls._clients.clear()
+        cls._client_users.clear()
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
     
     async def __aenter__(self):
         return self
@@ -63,14 +145,24 @@ class PolymarketAdapter:
         limit: int = 100,
         active_only: bool = True,
         closed: bool = False,
+        offset: int = 0,
+        min_volume: Optional[float] = None,
+        tag_id: Optional[int] = None,
     ) -> list[Market]:
         """Fetch markets from Polymarket.
         
+        Everything except category is filtered by Gamma itself; category
+        names have no server-side filter (use tag_id for that), so they are
+        matched on the returned page.
+        
         Args:
             category: Filter by category (e.g., "Politics", "Crypto", "Sports")
             limit: Maximum number of markets to return
             active_only: Only return active markets
             closed: Include closed markets
+            offset: Number of markets to skip (for paging)
+            min_volume: Minimum market volume
+            tag_id: Gamma tag to filter by
             
         Returns:
             List of Market objects
@@ -78,10 +170,16 @@ class PolymarketAdapter:
         client = await self._get_client()
         
         params: dict[str, Any] = {"limit": limit}
+        if offset:
+            params["offset"] = offset
         if active_only:
             params["active"] = "true"
         if not closed:
             params["closed"] = "false"
+        if min_volume is not None:
+            params["volume_num_min"] = min_volume
+        if tag_id is not None:
+            params["tag_id"] = tag_id
         
         response = await client.get(
             f"{self.GAMMA_BASE_URL}/markets",
@@ -89,20 +187,14 @@ class PolymarketAdapter:
         )
         response.raise_for_status()
         
-        raw_markets = response.json()
+        raw_markets = orjson.loads(response.content)
         markets = []
+        needle = category.lower() if category else None
         
         for raw in raw_markets:
-            # Filter by category if specified
-            if category:
-                market_category = raw.get("category", "")
-                # Also check event category
-                events = raw.get("events", [])
-                event_categories = [e.get("category", "") for e in events]
-                all_categories = [market_category] + event_categories
-                
-                if not any(category.lower() in c.lower() for c in all_categories if c):
-                    continue
+            # Filter by category if specified (market or any event category)
+            if needle and not self._in_category(raw, needle):
+                continue
             
             market = self._parse_market(raw)
             if market:
@@ -110,6 +202,18 @@ class PolymarketAdapter:
         
         return markets[:limit]
     
+    @staticmethod
+    def _in_category(raw: dict, needle: str) -> bool:
+        """Whether the market's or one of its events' categories contains needle."""
+        market_category = raw.get("category")
+        if market_category and needle in market_category.lower():
+            return True
+        return any(
+            needle in c.lower()
+            for c in (e.get("category") for e in raw.get("events", []))
+            if c
+        )
+    
     async def get_market(self, market_id: str) -> Optional[Market]:
         """Fetch a single market by ID.
         
@@ -119,6 +223,24 @@ class PolymarketAdapter:
         Returns:
             Market object or None if not found
         """
+        raw = await self._get_raw_market(market_id)
+        if raw is None:
+            return None
+        return self._parse_market(raw)
+    
+    async def _get_raw_market(self, market_id: str) -> Optional[dict]:
+        """Fetch the raw Gamma record for a market, None if not found.
+        
+        Found markets are cached for MARKET_CACHE_TTL seconds.
+        """
+        now = time.monotonic()
+        cached = self._raw_market_cache.get(market_id)
+        if cached is not None:
+            if cached[0] > now:
+                self._raw_market_cache.move_to_end(market_id)
+                return cached[1]
+            del self._raw_market_cache[market_id]
+        
         client = await self._get_client()
         
         response = await client.get(
@@ -129,8 +251,15 @@ class PolymarketAdapter:
             return None
         response.raise_for_status()
         
-        raw = response.json()
-        return self._parse_market(raw)
+        raw = orjson.loads(response.content)
+        self._raw_market_cache[market_id] = (now + self.MARKET_CACHE_TTL, raw)
+        if len(self._raw_market_cache) > self.MARKET_CACHE_SIZE:
+            self._raw_market_cache.popitem(last=False)
+        return raw
+    
+    def invalidate(self, market_id: str) -> None:
+        """Drop a market's cached Gamma payload."""
+        self._raw_market_cache.pop(market_id, None)
     
     def _parse_market(self, raw: dict) -> Optional[Market]:
         """Parse raw API response into Market model.
@@ -150,7 +279,7 @@ class PolymarketAdapter:
             outcome_prices = raw.get("outcomePrices")
             if outcome_prices:
                 if isinstance(outcome_prices, str):
-                    prices = json.loads(outcome_prices)
+                    prices = orjson.loads(outcome_prices)
                 else:
                     prices = outcome_prices
                 if len(prices) >= 2:
@@ -158,13 +287,7 @@ class PolymarketAdapter:
                     no_price = float(prices[1]) if prices[1] else None
             
             # Parse end date
-            end_date = None
-            end_date_str = raw.get("endDate")
-            if end_date_str:
-                try:
-                    end_date = datetime.fromisoformat(end_date_str.replace("Z", "+00:00"))
-                except (ValueError, TypeError):
-                    pass
+            end_date = _parse_iso(raw.get("endDate"))
             
             # Determine category
             category = raw.get("category")
@@ -173,23 +296,13 @@ class PolymarketAdapter:
                 if events:
                     category = events[0].get("category")
             
-            # Parse first seen date
-            first_seen_str = raw.get("createdAt")
-            first_seen = datetime.utcnow()
-            if first_seen_str:
-                try:
-                    first_seen = datetime.fromisoformat(first_seen_str.replace("Z", "+00:00"))
-                except (ValueError, TypeError):
-                    pass
-            
-            # Parse last updated
-            updated_str = raw.get("updatedAt")
-            last_updated = datetime.utcnow()
-            if updated_str:
-                try:
-                    last_updated = datetime.fromisoformat(updated_str.replace("Z", "+00:00"))
-                except (ValueError, TypeError):
-                    pass
+            # Parse first seen and last updated dates (default: now)
+            first_seen = _parse_iso(raw.get("createdAt"))
+            last_updated = _parse_iso(raw.get("updatedAt"))
+            if first_seen is None or last_updated is None:
+                now = utcnow()
+                first_seen = first_seen or now
+                last_updated = last_updated or now
             
             return Market(
                 id=f"{self.PLATFORM_NAME}:{market_id}",
@@ -228,17 +341,12 @@ class PolymarketAdapter:
         Returns:
             Dict with 'yes_price', 'no_price' keys
         """
-        # First get market to get token IDs
-        market = await self.get_market(market_id)
+        # One Gamma fetch gives both the fallback prices and the token IDs
+        raw = await self._get_raw_market(market_id)
+        market = self._parse_market(raw) if raw is not None else None
         if not market:
             return {"yes_price": None, "no_price": None}
         
-        # Get token IDs from the raw market data
-        client = await self._get_client()
-        response = await client.get(f"{self.GAMMA_BASE_URL}/markets/{market_id}")
-        response.raise_for_status()
-        raw = response.json()
-        
         clob_token_ids = raw.get("clobTokenIds")
         if not clob_token_ids:
             # Return prices from market data if no CLOB tokens
@@ -248,7 +356,7 @@ class PolymarketAdapter:
             }
         
         if isinstance(clob_token_ids, str):
-            token_ids = json.loads(clob_token_ids)
+            token_ids = orjson.loads(clob_token_ids)
         else:
             token_ids = clob_token_ids
         
@@ -258,12 +366,8 @@ class PolymarketAdapter:
                 "no_price": market.no_price,
             }
         
-        yes_token_id = token_ids[0]
-        no_token_id = token_ids[1]
-        
-        # Fetch midpoint prices from CLOB
-        yes_price = await self._get_midpoint(yes_token_id)
-        no_price = await self._get_midpoint(no_token_id)
+        # Fetch both midpoint prices from CLOB in one round trip
+        yes_price, no_price = await self._get_midpoints(token_ids[:2])
         
         return {
             "yes_price": yes_price,
@@ -287,12 +391,40 @@ class PolymarketAdapter:
                 params={"token_id": token_id}
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             mid = data.get("mid")
             return float(mid) if mid else None
         except (httpx.HTTPError, ValueError, TypeError):
             return None
     
+    async def _get_midpoints(self, token_ids: list[str]) -> list[Optional[float]]:
+        """Get midpoint prices for several tokens from CLOB API.
+        
+        Uses the batch /midpoints endpoint; if that fails, falls back to
+        concurrent per-token /midpoint requests.
+        
+        Args:
+            token_ids: The CLOB token IDs
+            
+        Returns:
+            Midpoint prices (or None) in the same order as token_ids
+        """
+        client = await self._get_client()
+        
+        try:
+            response = await client.post(
+                f"{self.CLOB_BASE_URL}/midpoints",
+                json=[{"token_id": token_id} for token_id in token_ids],
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            mids = [data.get(token_id) for token_id in token_ids]
+            return [float(mid) if mid else None for mid in mids]
+        except (httpx.HTTPError, ValueError, TypeError, AttributeError):
+            return list(await asyncio.gather(
+                *(self._get_midpoint(token_id) for token_id in token_ids)
+            ))
+    
     async def get_orderbook(self, market_id: str, side: str = "YES") -> dict:
         """Get orderbook for a market outcome.
         
@@ -303,19 +435,15 @@ class PolymarketAdapter:
         Returns:
             Orderbook data with bids and asks
         """
-        client = await self._get_client()
-        
         # Get token ID
-        response = await client.get(f"{self.GAMMA_BASE_URL}/markets/{market_id}")
-        response.raise_for_status()
-        raw = response.json()
+        raw = await self._get_raw_market(market_id)
         
-        clob_token_ids = raw.get("clobTokenIds")
+        clob_token_ids = raw.get("clobTokenIds") if raw else None
         if not clob_token_ids:
             return {"bids": [], "asks": [], "market": market_id}
         
         if isinstance(clob_token_ids, str):
-            token_ids = json.loads(clob_token_ids)
+            token_ids = orjson.loads(clob_token_ids)
         else:
             token_ids = clob_token_ids
         
@@ -326,13 +454,14 @@ class PolymarketAdapter:
         token_id = token_ids[token_idx]
         
         # Fetch orderbook from CLOB
+        client = await self._get_client()
         book_response = await client.get(
             f"{self.CLOB_BASE_URL}/book",
             params={"token_id": token_id}
         )
         book_response.raise_for_status()
         
-        return book_response.json()
+        return orjson.loads(book_response.content)
     
     # =========================================================================
     # Paper Trading (Stubs)
@@ -359,43 +488,37 @@ class PolymarketAdapter:
             Paper order ID
         """
         order_id = f"paper_{uuid.uuid4().hex[:12]}"
+        side = side.upper()
+        now = utcnow().isoformat()
+        self.invalidate(market_id)
         
-        self._paper_orders[order_id] = {
+        order = {
             "order_id": order_id,
             "market_id": market_id,
-            "side": side.upper(),
+            "side": side,
             "price": price,
             "amount": amount,
             "status": "open",
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": now,
             "filled_at": None,
             "paper_trading": True,
         }
+        self._paper_orders[order_id] = order
         
         # For simplicity, immediately "fill" market orders at the specified price
         # In a real implementation, this would check the orderbook
         shares = amount / price
-        position_key = f"{market_id}:{side.upper()}"
+        row = self._position_row(market_id, side)
         
-        if position_key not in self._paper_positions:
-            self._paper_positions[position_key] = {
-                "market_id": market_id,
-                "side": side.upper(),
-                "shares": 0,
-                "avg_price": 0,
-                "total_cost": 0,
-            }
-        
-        pos = self._paper_positions[position_key]
-        new_shares = pos["shares"] + shares
-        new_cost = pos["total_cost"] + amount
-        pos["shares"] = new_shares
-        pos["total_cost"] = new_cost
-        pos["avg_price"] = new_cost / new_shares if new_shares > 0 else 0
+        new_shares = float(self._position_shares[row]) + shares
+        new_cost = float(self._position_cost[row]) + amount
+        self._position_shares[row] = new_shares
+        self._position_cost[row] = new_cost
+        self._position_avg_price[row] = new_cost / new_shares if new_shares > 0 else 0
         
-        self._paper_orders[order_id]["status"] = "filled"
-        self._paper_orders[order_id]["filled_at"] = datetime.utcnow().isoformat()
-        self._paper_orders[order_id]["shares_filled"] = shares
+        order["status"] = "filled"
+        order["filled_at"] = now
+        order["shares_filled"] = shares
         
         return order_id
     
@@ -405,16 +528,42 @@ class PolymarketAdapter:
         Returns:
             List of position dicts
         """
+        n = len(self._position_keys)
+        rows = np.flatnonzero(self._position_shares[:n] > 0)
         return [
             {
-                **pos,
-                "position_id": key,
+                "market_id": market_id,
+                "side": side,
+                "shares": shares,
+                "avg_price": avg_price,
+                "total_cost": total_cost,
+                "position_id": position_id,
                 "paper_trading": True,
             }
-            for key, pos in self._paper_positions.items()
-            if pos["shares"] > 0
+            for (position_id, market_id, side), shares, avg_price, total_cost in zip(
+                [self._position_keys[i] for i in rows.tolist()],
+                self._position_shares[rows].tolist(),
+                self._position_avg_price[rows].tolist(),
+                self._position_cost[rows].tolist(),
+            )
         ]
     
+    def _position_row(self, market_id: str, side: str) -> int:
+        """Row of a paper position, adding an empty one if it's new."""
+        position_id = f"{market_id}:{side}"
+        row = self._position_rows.get(position_id)
+        if row is None:
+            row = len(self._position_keys)
+            if row == self._position_shares.size:
+                # Double the capacity of every column
+                grow = np.zeros(row)
+                self._position_shares = np.concatenate([self._position_shares, grow])
+                self._position_cost = np.concatenate([self._position_cost, grow])
+                self._position_avg_price = np.concatenate([self._position_avg_price, grow])
+            self._position_rows[position_id] = row
+            self._position_keys.append((position_id, market_id, side))
+        return row
+    
     async def get_order(self, order_id: str) -> Optional[dict]:
         """Get a paper order by ID.
         
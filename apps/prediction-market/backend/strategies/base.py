@@ -1,12 +1,33 @@
 """Base strategy class."""
 
+import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Optional
+
+import numpy as np
 from pydantic import BaseModel
+from ..config import settings
 from ..models.market import Market, MarketOpportunity
 from ..models.trade import TradeCreate
 
 
+# Trades built from already-validated opportunities skip re-validation;
+# debug runs validate them anyway.
+TRUSTED_TRADES = not settings.debug
+
+# TradeBase.entry_price bounds. Market prices can fall outside them (e.g. a
+# NO price of 0.995), so the trusted path still checks the price.
+MIN_ENTRY_PRICE = 0.01
+MAX_ENTRY_PRICE = 0.99
+
+
+@lru_cache(maxsize=64)
+def _keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern:
+    """One alternation matching any keyword, shared by every strategy using the same list."""
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
 class StrategyConfig(BaseModel):
     """Base configuration for strategies."""
     enabled: bool = True
@@ -17,7 +38,11 @@ class StrategyConfig(BaseModel):
 
 
 class BaseStrategy(ABC):
-    """Abstract base class for trading strategies."""
+    """Abstract base class for trading strategies.
+    
+    Instances are shared across requests, so strategies must not keep
+    per-scan state; everything besides the config is passed in.
+    """
     
     name: str = "base"
     description: str = "Base strategy"
@@ -27,6 +52,20 @@ class BaseStrategy(ABC):
         if config:
             self.config = self.config.model_copy(update=config)
     
+    @property
+    def config(self) -> StrategyConfig:
+        """Strategy configuration; assign a new config rather than mutating it."""
+        return self._config
+    
+    @config.setter
+    def config(self, config: StrategyConfig) -> None:
+        self._config = config
+        self._prepare(config)
+    
+    def _prepare(self, config: StrategyConfig) -> None:
+        """Precompute lookups derived from the config, rerun on every assignment."""
+        self._excluded_categories = frozenset(c.lower() for c in config.excluded_categories)
+    
     @classmethod
     @abstractmethod
     def get_default_config(cls) -> StrategyConfig:
@@ -51,6 +90,31 @@ class BaseStrategy(ABC):
         """Create a trade from an opportunity."""
         pass
     
+    def _set_keywords(self, keywords: list[str]) -> None:
+        """Use these keywords for _find_keywords (call from _prepare)."""
+        self._keywords = tuple(keywords)
+        # One scan over the question finds whether any keyword occurs at all
+        self._keyword_re = _keyword_pattern(self._keywords)
+    
+    def _find_keywords(self, question_lower: str) -> tuple[bool, list[str]]:
+        """Keywords (substring matches, in config order) in a lowercased question."""
+        # Most questions match nothing; only list keywords once the
+        # combined pattern hits
+        if not self._keyword_re.search(question_lower):
+            return False, []
+        found_keywords = [k for k in self._keywords if k in question_lower]
+        return len(found_keywords) > 0, found_keywords
+    
+    def _new_trade(self, **fields) -> TradeCreate:
+        """Build a TradeCreate from opportunity fields (unvalidated if trusted).
+        
+        Prices outside the allowed range always go through validation, so
+        they raise ValidationError whether or not trades are trusted.
+        """
+        if TRUSTED_TRADES and MIN_ENTRY_PRICE <= fields["entry_price"] <= MAX_ENTRY_PRICE:
+            return TradeCreate.model_construct(**fields)
+        return TradeCreate(**fields)
+    
     def calculate_position_size(self, opportunity: MarketOpportunity) -> float:
         """Calculate position size based on Kelly criterion or fixed."""
         # Simple fixed sizing for now
@@ -59,8 +123,15 @@ class BaseStrategy(ABC):
             opportunity.recommended_amount
         )
     
+    def calculate_position_sizes(self, opportunities: list[MarketOpportunity]) -> np.ndarray:
+        """Position sizes for many opportunities at once (same rule as above)."""
+        amounts = np.fromiter(
+            (o.recommended_amount for o in opportunities), dtype=np.float64, count=len(opportunities)
+        )
+        return np.minimum(amounts, self.config.max_position_size)
+    
     def is_excluded(self, market: Market) -> bool:
         """Check if market category is excluded."""
         if not market.category:
             return False
-        return market.category.lower() in [c.lower() for c in self.config.excluded_categories]
+        return market.category.lower() in self._excluded_categories
@@ -1,6 +1,8 @@
 """Nothing Ever Happens strategy - bet NO on dramatic predictions."""
 
 from typing import Optional
+
+import numpy as np
 from pydantic import BaseModel
 from .base import BaseStrategy, StrategyConfig
 from ..models.market import Market, MarketOpportunity
@@ -34,18 +36,17 @@ class NothingEverHappensStrategy(BaseStrategy):
         super().__init__(config)
         self.config: NEHConfig
     
+    def _prepare(self, config: NEHConfig) -> None:
+        super()._prepare(config)
+        self._set_keywords(config.sensational_keywords)
+    
     @classmethod
     def get_default_config(cls) -> NEHConfig:
         return NEHConfig()
     
     def is_sensational(self, question: str) -> tuple[bool, list[str]]:
         """Check if question contains sensational language."""
-        question_lower = question.lower()
-        found_keywords = []
-        for keyword in self.config.sensational_keywords:
-            if keyword in question_lower:
-                found_keywords.append(keyword)
-        return len(found_keywords) > 0, found_keywords
+        return self._find_keywords(question.lower())
     
     def should_bet(self, market: Market) -> tuple[bool, str]:
         """Check if this market fits the NEH strategy."""
@@ -66,32 +67,52 @@ class NothingEverHappensStrategy(BaseStrategy):
             return False, f"YES price {market.yes_price} above max {self.config.max_yes_price}"
         
         # Check for sensational language
-        is_sensational, keywords = self.is_sensational(market.question)
+        is_sensational, keywords = self._find_keywords(market.question_lower)
         if not is_sensational:
             return False, "No sensational keywords found"
         
         return True, f"Sensational keywords: {', '.join(keywords)}"
     
+    def _price_volume_mask(self, markets: list[Market]) -> np.ndarray:
+        """Markets passing should_bet's volume and price checks."""
+        n = len(markets)
+        # Missing (or zero) volume is not filtered, missing prices are
+        volumes = np.fromiter((m.volume or np.nan for m in markets), dtype=np.float64, count=n)
+        yes_prices = np.fromiter(
+            (np.nan if m.yes_price is None else m.yes_price for m in markets), dtype=np.float64, count=n
+        )
+        has_no_price = np.fromiter((m.no_price is not None for m in markets), dtype=bool, count=n)
+        return (
+            ~(volumes < self.config.min_volume)
+            & has_no_price
+            & (yes_prices <= self.config.max_yes_price)
+        )
+    
     async def scan_markets(self, markets: list[Market]) -> list[MarketOpportunity]:
         """Scan markets for NEH opportunities."""
-        opportunities = []
-        
-        for market in markets:
-            should_bet, reason = self.should_bet(market)
-            if not should_bet:
+        # Same checks as should_bet: the numeric ones for all markets at
+        # once, then exclusions and keywords only for the survivors
+        accepted = []
+        for i in np.flatnonzero(self._price_volume_mask(markets)).tolist():
+            market = markets[i]
+            if self.is_excluded(market):
                 continue
-            
-            # Calculate expected value
-            # If YES is at 0.10, betting NO at 0.90 wins 0.10 when NO hits
-            # Historical: ~78% of dramatic YES fail, so NO wins 78%
-            implied_prob = market.no_price
-            our_prob = 0.78  # Based on academic research
-            ev = (our_prob * (1 - market.no_price)) - ((1 - our_prob) * market.no_price)
-            
-            # Clamp signal strength to valid 0-1 range
-            signal = max(0.0, min(1.0, ev * 5))  # Scale EV to 0-1, clamp
-            
-            opportunities.append(MarketOpportunity(
+            is_sensational, keywords = self._find_keywords(market.question_lower)
+            if is_sensational:
+                accepted.append((market, f"Sensational keywords: {', '.join(keywords)}"))
+        
+        # Calculate expected value for all accepted markets at once
+        # If YES is at 0.10, betting NO at 0.90 wins 0.10 when NO hits
+        # Historical: ~78% of dramatic YES fail, so NO wins 78%
+        no_prices = np.fromiter((m.no_price for m, _ in accepted), dtype=np.float64, count=len(accepted))
+        our_prob = 0.78  # Based on academic research
+        evs = (our_prob * (1 - no_prices)) - ((1 - our_prob) * no_prices)
+        
+        # Clamp signal strength to valid 0-1 range
+        signals = np.clip(evs * 5, 0.0, 1.0)  # Scale EV to 0-1, clamp
+        
+        return [
+            MarketOpportunity(
                 market=market,
                 strategy=self.name,
                 signal_strength=signal,
@@ -99,13 +120,13 @@ class NothingEverHappensStrategy(BaseStrategy):
                 recommended_amount=self.config.position_size,
                 expected_value=ev,
                 reasoning=f"NEH: {reason}. YES at {market.yes_price:.0%} implies unlikely event. Historical: 78% fail."
-            ))
-        
-        return opportunities
+            )
+            for (market, reason), ev, signal in zip(accepted, evs.tolist(), signals.tolist())
+        ]
     
     def create_trade(self, opportunity: MarketOpportunity) -> TradeCreate:
         """Create a trade from an opportunity."""
-        return TradeCreate(
+        return self._new_trade(
             platform=opportunity.market.platform,
             market_id=opportunity.market.market_id,
             market_question=opportunity.market.question,
@@ -1,6 +1,8 @@
 """Yield Farming strategy - bet NO on absurd predictions for steady returns."""
 
 from typing import Optional
+
+import numpy as np
 from .base import BaseStrategy, StrategyConfig
 from ..models.market import Market, MarketOpportunity
 from ..models.trade import TradeCreate, TradeSide
@@ -34,18 +36,17 @@ class YieldFarmingStrategy(BaseStrategy):
         super().__init__(config)
         self.config: YieldConfig
     
+    def _prepare(self, config: YieldConfig) -> None:
+        super()._prepare(config)
+        self._set_keywords(config.absurdity_keywords)
+    
     @classmethod
     def get_default_config(cls) -> YieldConfig:
         return YieldConfig()
     
     def is_absurd(self, question: str) -> tuple[bool, list[str]]:
         """Check if question is absurd/impossible."""
-        question_lower = question.lower()
-        found_keywords = []
-        for keyword in self.config.absurdity_keywords:
-            if keyword in question_lower:
-                found_keywords.append(keyword)
-        return len(found_keywords) > 0, found_keywords
+        return self._find_keywords(question.lower())
     
     def should_bet(self, market: Market) -> tuple[bool, str]:
         """Check if this market fits yield farming."""
@@ -61,7 +62,7 @@ class YieldFarmingStrategy(BaseStrategy):
             return False, f"NO price {market.no_price} below {self.config.min_no_price}"
         
         # Check for absurdity
-        is_absurd, keywords = self.is_absurd(market.question)
+        is_absurd, keywords = self._find_keywords(market.question_lower)
         if not is_absurd:
             return False, "No absurdity keywords found"
         
@@ -69,33 +70,44 @@ class YieldFarmingStrategy(BaseStrategy):
     
     async def scan_markets(self, markets: list[Market]) -> list[MarketOpportunity]:
         """Scan for yield farming opportunities."""
-        opportunities = []
-        
-        for market in markets:
-            should_bet, reason = self.should_bet(market)
-            if not should_bet:
+        # Same checks as should_bet: the price check for all markets at
+        # once (missing prices fail it), then exclusions and keywords only
+        # for the survivors
+        no_prices = np.fromiter(
+            (np.nan if m.no_price is None else m.no_price for m in markets), dtype=np.float64, count=len(markets)
+        )
+        accepted = []
+        for i in np.flatnonzero(no_prices >= self.config.min_no_price).tolist():
+            market = markets[i]
+            if self.is_excluded(market):
                 continue
-            
-            # Calculate yield
-            # Betting $100 on NO at 0.97 = get 100/0.97 = 103.09 shares
-            # If NO wins (99.9% likely), return is 103.09, profit = $3.09 = 3.09%
-            implied_yield = (1 / market.no_price - 1) * 100
-            
-            opportunities.append(MarketOpportunity(
+            is_absurd, keywords = self._find_keywords(market.question_lower)
+            if is_absurd:
+                accepted.append((market, f"Absurd prediction: {', '.join(keywords)}"))
+        
+        # Calculate yield
+        # Betting $100 on NO at 0.97 = get 100/0.97 = 103.09 shares
+        # If NO wins (99.9% likely), return is 103.09, profit = $3.09 = 3.09%
+        no_prices = np.fromiter((m.no_price for m, _ in accepted), dtype=np.float64, count=len(accepted))
+        implied_yields = (1 / no_prices - 1) * 100
+        signals = np.minimum(no_prices, 1.0)
+        
+        return [
+            MarketOpportunity(
                 market=market,
                 strategy=self.name,
-                signal_strength=min(1.0, market.no_price),
+                signal_strength=signal,
                 recommended_side="no",
                 recommended_amount=self.config.position_size,
                 expected_value=implied_yield / 100,
                 reasoning=f"Yield: {reason}. NO at {market.no_price:.1%} = {implied_yield:.1f}% yield if it resolves NO."
-            ))
-        
-        return opportunities
+            )
+            for (market, reason), implied_yield, signal in zip(accepted, implied_yields.tolist(), signals.tolist())
+        ]
     
     def create_trade(self, opportunity: MarketOpportunity) -> TradeCreate:
         """Create a trade."""
-        return TradeCreate(
+        return self._new_trade(
             platform=opportunity.market.platform,
             market_id=opportunity.market.market_id,
             market_question=opportunity.market.question,
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.analysis.improvement import (
+    ParameterTuner,
+    ResolutionAnalyzer,
+    StrategyEvaluator,
+    analyze_and_improve,
+)
+from backend.models.trade import Trade, TradeStatus, utcnow
+
+
+def make_trade(
+    trade_id: str,
+    *,
+    strategy: str = "test-strategy",
+    status: TradeStatus = TradeStatus.RESOLVED_WIN,
+    amount: float = 10.0,
+    entry_price: float = 0.6,
+    pnl: float | None = None,
+    clv: float | None = None,
+    closing_price: float | None = None,
+    created_at: datetime | None = None,
+) -> Trade:
+    if created_at is None:
+        created_at = utcnow() - timedelta(hours=1)
+    return Trade(
+        id=trade_id,
+        created_at=created_at,
+        updated_at=created_at,
+        platform="polymarket",
+        market_id="1",
+        market_question="Will it rain tomorrow?",
+        market_category="weather",
+        side="yes",
+        entry_price=entry_price,
+        amount=amount,
+        strategy=strategy,
+        status=status,
+        pnl=pnl,
+        clv=clv,
+        closing_price=closing_price,
+    )
+
+
+def test_compare_strategies_matches_evaluate_in_first_seen_order():
+    trades = [
+        make_trade("t1", strategy="zeta", pnl=5.0, clv=2.0),
+        make_trade("t2", strategy="alpha", status=TradeStatus.RESOLVED_LOSS, pnl=-10.0, clv=-1.0),
+        make_trade("t3", strategy="zeta", status=TradeStatus.OPEN),
+        make_trade("t4", strategy="alpha", pnl=4.0),
+    ]
+    evaluator = StrategyEvaluator(trades)
+
+    comparison = evaluator.compare_strategies()
+
+    assert list(comparison) == ["zeta", "alpha"]
+    for name, performance in comparison.items():
+        expected = evaluator.evaluate_strategy(name, end_date=performance.end_date)
+        assert performance.model_dump() == expected.model_dump()
+
+    assert comparison["zeta"].total_trades == 2
+    assert comparison["zeta"].open_trades == 1
+    assert comparison["alpha"].wins == 1
+    assert comparison["alpha"].total_pnl == -6.0
+
+
+def test_analyze_resolved_trades_matches_per_trade_analysis():
+    trades = [
+        make_trade("t1", pnl=5.0, closing_price=0.75),
+        make_trade("t2", status=TradeStatus.OPEN),
+        make_trade("t3", status=TradeStatus.RESOLVED_LOSS, amount=80.0, entry_price=0.9, closing_price=0.5),
+        make_trade("t4", amount=0.5, entry_price=0.2),
+    ]
+    analyzer = ResolutionAnalyzer(trades)
+
+    batch = analyzer.analyze_resolved_trades()
+
+    resolved = [t for t in trades if t.status != TradeStatus.OPEN]
+    expected = [analyzer.analyze_resolved_trade(t).model_dump() for t in resolved]
+    assert [a.model_dump() for a in batch] == expected
+    assert [a.model_dump() for a in ResolutionAnalyzer().analyze_resolved_trades(resolved)] == expected
+    assert [a.was_good_sizing for a in batch] == [True, False, False]
+
+    with pytest.raises(ValueError):
+        analyzer.analyze_resolved_trades(trades)
+
+
+def test_position_sizing_counts_zero_clv_trades():
+    large = [make_trade(f"l{i}", amount=40.0, clv=clv) for i, clv in enumerate([0.0, 0.0, -3.0])]
+    small = [make_trade(f"s{i}", amount=10.0, clv=3.0) for i in range(3)]
+
+    suggestions = ParameterTuner(large + small)._analyze_position_sizing()
+
+    # Zero CLVs pull the large-trade mean to -1.0%, not -3.0%
+    assert suggestions == [
+        "Larger positions underperforming (CLV: -1.0% vs 3.0%) - consider smaller sizes"
+    ]
+
+
+def test_analyze_and_improve_reflects_trade_changes():
+    trades = [make_trade(f"t{i}", pnl=1.0, clv=1.0) for i in range(6)]
+
+    first = analyze_and_improve(trades)
+    assert first["strategy_performance"]["test-strategy"].wins == 6
+
+    # Changed without bumping updated_at
+    updated = trades[0].model_copy(update={"status": TradeStatus.RESOLVED_LOSS})
+    second = analyze_and_improve([updated] + trades[1:])
+    assert second["strategy_performance"]["test-strategy"].wins == 5
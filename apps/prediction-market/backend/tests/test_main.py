@@ -0,0 +1,241 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend import main
+from backend.db import database
+from backend.main import _get_strategy_performance, list_trades
+from backend.models.trade import Base as TradeBase
+from backend.models.trade import (
+    Trade, TradeCreate, TradeDB, TradeResolution, TradeStatus, TradeUpdate, utcnow,
+)
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="function")
+
+
+@pytest_asyncio.fixture
+async def db_session() -> AsyncSession:
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(TradeBase.metadata.create_all)
+
+    SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with SessionLocal() as session:
+        yield session
+
+    await engine.dispose()
+
+
+def make_trade_db(
+    *,
+    status: TradeStatus,
+    amount: float,
+    strategy: str = "nothing_ever_happens",
+    pnl: float | None = None,
+    clv: float | None = None,
+    created_at: datetime | None = None,
+) -> TradeDB:
+    now = created_at or utcnow()
+    return TradeDB(
+        id=str(uuid.uuid4()),
+        created_at=now,
+        updated_at=now,
+        platform="polymarket",
+        market_id="1",
+        market_question="Will it rain tomorrow?",
+        side="yes",
+        entry_price=0.5,
+        amount=amount,
+        shares=amount / 0.5,
+        strategy=strategy,
+        status=status.value,
+        pnl=pnl,
+        clv=clv,
+    )
+
+
+async def test_strategy_performance_aggregates_by_status(db_session: AsyncSession):
+    db_session.add_all([
+        make_trade_db(status=TradeStatus.OPEN, amount=10.0, clv=0.5),
+        make_trade_db(status=TradeStatus.RESOLVED_WIN, amount=20.0, pnl=20.0, clv=0.1),
+        make_trade_db(status=TradeStatus.RESOLVED_WIN, amount=30.0, pnl=None, clv=None),
+        make_trade_db(status=TradeStatus.RESOLVED_LOSS, amount=40.0, pnl=-40.0, clv=-0.3),
+        make_trade_db(status=TradeStatus.CANCELLED, amount=5.0, clv=0.0),
+        make_trade_db(status=TradeStatus.RESOLVED_WIN, amount=99.0, pnl=99.0, strategy="other"),
+    ])
+    await db_session.commit()
+
+    performance = await _get_strategy_performance(db_session, "nothing_ever_happens")
+
+    assert performance["total_trades"] == 5
+    assert performance["open_trades"] == 1
+    assert performance["resolved_trades"] == 4
+    assert performance["wins"] == 2
+    assert performance["losses"] == 2
+    assert performance["total_wagered"] == pytest.approx(105.0)
+    assert performance["total_pnl"] == pytest.approx(-20.0)
+    # Open trades are excluded from CLV stats
+    assert performance["avg_clv"] == pytest.approx(-0.2 / 3)
+    assert performance["clv_positive_rate"] == pytest.approx(1 / 3)
+
+    assert await _get_strategy_performance(db_session, "missing") == {
+        "trades": 0,
+        "message": "No trades found",
+    }
+
+
+async def test_strategy_performance_cache_tracks_out_of_band_writes(db_session: AsyncSession, monkeypatch):
+    db_session.add(make_trade_db(status=TradeStatus.OPEN, amount=10.0, strategy="cached"))
+    await db_session.commit()
+
+    calls = []
+    calculate = main._calculate_strategy_performance
+
+    async def counting_calculate(*args, **kwargs):
+        calls.append(args[1:])
+        return await calculate(*args, **kwargs)
+
+    monkeypatch.setattr(main, "_calculate_strategy_performance", counting_calculate)
+
+    first = await _get_strategy_performance(db_session, "cached")
+    second = await _get_strategy_performance(db_session, "cached")
+    assert first == second
+    assert len(calls) == 1
+
+    # A write that bypasses the API (no version bump) still invalidates
+    db_session.add(make_trade_db(status=TradeStatus.OPEN, amount=15.0, strategy="cached"))
+    await db_session.commit()
+
+    third = await _get_strategy_performance(db_session, "cached")
+    assert third["total_trades"] == 2
+    assert third["total_wagered"] == pytest.approx(25.0)
+    assert len(calls) == 2
+
+
+async def test_list_trades_pages_and_reports_total_count(db_session: AsyncSession):
+    start = datetime(2024, 1, 1)
+    db_session.add_all([
+        make_trade_db(status=TradeStatus.OPEN, amount=float(i + 1), created_at=start + timedelta(days=i))
+        for i in range(5)
+    ])
+    db_session.add(make_trade_db(status=TradeStatus.RESOLVED_WIN, amount=50.0, created_at=start))
+    await db_session.commit()
+
+    response = await list_trades(status="open", limit=2, offset=1, db=db_session)
+    assert [t["amount"] for t in json.loads(response.body)] == [4.0, 3.0]
+    assert response.headers["X-Total-Count"] == "5"
+
+    response = await list_trades(status="open", limit=2, offset=10, db=db_session)
+    assert json.loads(response.body) == []
+    assert response.headers["X-Total-Count"] == "5"
+
+
+async def test_overall_performance_short_circuits_empty_table(db_session: AsyncSession, monkeypatch):
+    async def fail(*args, **kwargs):
+        raise AssertionError("strategy performance should not be queried")
+
+    monkeypatch.setattr(main, "_get_strategy_performance", fail)
+
+    performance = await main._calculate_overall_performance(db_session, "all_time")
+
+    assert performance["total_trades"] == 0
+    assert performance["overall_roi"] == 0
+    assert performance["strategies"] == {
+        name: {"trades": 0, "message": "No trades found"} for name in main.STRATEGIES
+    }
+
+
+async def test_resolve_trades_matches_update_trade(db_session: AsyncSession, monkeypatch, tmp_path):
+    monkeypatch.setattr(main.settings, "trade_log_path", tmp_path / "trades.jsonl")
+    trades = [
+        make_trade_db(status=TradeStatus.OPEN, amount=10.0),
+        make_trade_db(status=TradeStatus.OPEN, amount=20.0),
+        make_trade_db(status=TradeStatus.OPEN, amount=30.0, pnl=5.0, clv=0.2),
+        make_trade_db(status=TradeStatus.OPEN, amount=40.0),
+    ]
+    twins = [
+        make_trade_db(status=TradeStatus.OPEN, amount=t.amount, pnl=t.pnl, clv=t.clv)
+        for t in trades
+    ]
+    db_session.add_all(trades + twins)
+    await db_session.commit()
+
+    resolutions = {
+        trades[0].id: TradeResolution(outcome="yes", closing_price=0.7),
+        trades[1].id: TradeResolution(outcome="no"),
+        trades[2].id: TradeResolution(outcome="yes", closing_price=0.4),
+        trades[3].id: TradeResolution(outcome="no", closing_price=0.0),
+    }
+    resolved = await main.resolve_trades(resolutions, db=db_session)
+
+    for twin, resolution in zip(twins, resolutions.values()):
+        status = TradeStatus.RESOLVED_WIN if resolution.outcome == twin.side else TradeStatus.RESOLVED_LOSS
+        await main.update_trade(
+            twin.id,
+            TradeUpdate(
+                status=status,
+                resolution_outcome=resolution.outcome.value,
+                closing_price=resolution.closing_price,
+            ),
+            db=db_session,
+        )
+
+    fields = ["status", "resolution_outcome", "closing_price", "pnl", "roi", "clv", "was_good_trade"]
+    expected = [Trade.model_validate(t).model_dump(include=set(fields)) for t in twins]
+    assert [t.model_dump(include=set(fields)) for t in resolved] == expected
+    assert [t.pnl for t in resolved] == [10.0, -20.0, 5.0, -40.0]
+    assert resolved[3].clv == resolved[3].entry_price
+
+
+async def test_resolve_trades_rejects_unknown_ids(db_session: AsyncSession):
+    trade = make_trade_db(status=TradeStatus.OPEN, amount=10.0)
+    db_session.add(trade)
+    await db_session.commit()
+
+    with pytest.raises(HTTPException) as excinfo:
+        await main.resolve_trades(
+            {trade.id: TradeResolution(outcome="yes"), "missing": TradeResolution(outcome="no")},
+            db=db_session,
+        )
+    assert excinfo.value.status_code == 404
+
+    await db_session.refresh(trade)
+    assert trade.status == TradeStatus.OPEN.value
+    assert trade.pnl is None
+
+
+async def test_create_trades_inserts_batch(db_session: AsyncSession, monkeypatch, tmp_path):
+    monkeypatch.setattr(main.settings, "trade_log_path", tmp_path / "trades.jsonl")
+    monkeypatch.setattr(database, "BULK_INSERT_CHUNK_SIZE", 2)
+    trades = [
+        TradeCreate(
+            platform="polymarket",
+            market_id=str(i),
+            market_question="Will it rain tomorrow?",
+            side="yes" if i % 2 else "no",
+            entry_price=0.5,
+            amount=float(i + 1),
+            strategy="nothing_ever_happens",
+            entry_context={"rank": i} if i else None,
+        )
+        for i in range(5)
+    ]
+
+    created = await main.create_trades(trades, db=db_session)
+
+    stored = {t.id: t for t, in (await db_session.execute(select(TradeDB))).all()}
+    assert len(stored) == 5
+    for trade, result in zip(trades, created):
+        assert Trade.model_validate(stored[result.id]) == result
+        assert result.shares == trade.amount / 0.5
+        assert result.entry_context == trade.entry_context
+        assert result.status == TradeStatus.OPEN
+    assert len((tmp_path / "trades.jsonl").read_text().splitlines()) == 5
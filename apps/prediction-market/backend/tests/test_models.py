@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from backend.models.market import Market, MarketOpportunity
+from backend.models.trade import TradeBase, days_to_expiry
+from backend.strategies import base
+from backend.strategies.base import MAX_ENTRY_PRICE, MIN_ENTRY_PRICE
+from backend.strategies.yield_farming import YieldFarmingStrategy
+
+
+def test_days_to_expiry_floors_and_mixes_naive_with_aware():
+    created = datetime(2024, 1, 1, 12, 0)
+
+    assert days_to_expiry(created, None) is None
+    assert days_to_expiry(created, datetime(2024, 1, 9, 11, 59)) == 7
+    assert days_to_expiry(created, datetime(2024, 1, 9, 12, 0, tzinfo=timezone.utc)) == 8
+    assert days_to_expiry(created, datetime(2024, 1, 1, 11, 0)) == -1
+
+
+def test_entry_price_bounds_match_trade_model():
+    bounds = TradeBase.model_fields["entry_price"].metadata
+    assert [getattr(b, "ge", None) or getattr(b, "le", None) for b in bounds] == [
+        MIN_ENTRY_PRICE,
+        MAX_ENTRY_PRICE,
+    ]
+
+
+@pytest.mark.parametrize("trusted", [True, False])
+def test_create_trade_rejects_out_of_range_price_in_both_modes(monkeypatch, trusted):
+    monkeypatch.setattr(base, "TRUSTED_TRADES", trusted)
+    now = datetime(2024, 1, 1)
+    market = Market(
+        id="polymarket:m1",
+        platform="polymarket",
+        market_id="m1",
+        question="Will the impossible happen?",
+        first_seen=now,
+        last_updated=now,
+        yes_price=0.005,
+        no_price=0.995,
+    )
+    opportunity = MarketOpportunity(
+        market=market,
+        strategy="yield_farming",
+        signal_strength=0.5,
+        recommended_side="no",
+        recommended_amount=10.0,
+        expected_value=0.005,
+        reasoning="test",
+    )
+
+    with pytest.raises(ValidationError):
+        YieldFarmingStrategy().create_trade(opportunity)
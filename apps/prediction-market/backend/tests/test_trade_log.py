@@ -0,0 +1,35 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.config import settings
+from backend.trade_log import TradeLogWriter
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="function")
+
+
+async def test_trade_log_writer_batches_and_flushes_on_stop(tmp_path):
+    path = tmp_path / "logs" / "trades.jsonl"
+    writer = TradeLogWriter(max_batch=3, max_delay=0.01)
+    await writer.start(path)
+
+    for i in range(5):
+        writer.write({"action": "trade_created", "trade_id": str(i)})
+    await asyncio.sleep(0.05)
+    writer.write({"action": "trade_updated", "trade_id": "0"})
+    await writer.stop()
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["trade_id"] for e in entries] == ["0", "1", "2", "3", "4", "0"]
+    assert entries[-1]["action"] == "trade_updated"
+
+
+async def test_trade_log_writer_appends_synchronously_when_not_started(tmp_path, monkeypatch):
+    path = tmp_path / "logs" / "trades.jsonl"
+    monkeypatch.setattr(settings, "trade_log_path", path)
+
+    TradeLogWriter().write({"action": "trade_created", "trade_id": "t1"})
+
+    assert json.loads(path.read_text()) == {"action": "trade_created", "trade_id": "t1"}
@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from backend.config import settings
 from backend.models.market import Market, MarketOpportunity
 from backend.models.trade import Base as TradeBase
-from backend.models.trade import TradeDB, TradeStatus
+from backend.models.trade import TradeDB, TradeStatus, utcnow
 from backend.trading import ExposureReport, PaperTrader, Position, PositionManager, RiskManager, TradingEngine
 
 
@@ -18,7 +18,7 @@ pytestmark = pytest.mark.asyncio(loop_scope="function")
 
 def make_market(now: datetime | None = None) -> Market:
     if now is None:
-        now = datetime.utcnow()
+        now = utcnow()
     return Market(
         id="polymarket:1",
         platform="polymarket",
@@ -61,8 +61,7 @@ def make_exposure(total: float = 0.0, daily_traded: float = 0.0) -> ExposureRepo
 
 @pytest_asyncio.fixture
 async def db_session() -> AsyncSession:
-    db_url = f"sqlite+aiosqlite:///file:{uuid.uuid4().hex}?mode=memory&cache=shared"
-    engine = create_async_engine(db_url, connect_args={"uri": True})
+    engine = create_async_engine("sqlite+aiosqlite://")
 
     async with engine.begin() as conn:
         await conn.run_sync(TradeBase.metadata.create_all)
@@ -158,13 +157,26 @@ async def test_risk_manager_check_limits_various_scenarios(db_session: AsyncSess
             current_value=10.0,
             unrealized_pnl=0.0,
             strategy="test-strategy",
-            opened_at=datetime.utcnow(),
+            opened_at=utcnow(),
         )
     ]
     result = await risk_manager.check_limits(opportunity, make_exposure(), existing_positions, db_session)
     assert result.allowed is False
     assert result.details["limit"] == "positions_per_market"
 
+    # Without a positions list, the open trades in the market are counted in the database
+    await insert_trade(
+        db_session,
+        amount=10.0,
+        platform=market.platform,
+        strategy="test-strategy",
+        status=TradeStatus.OPEN.value,
+        created_at=utcnow(),
+    )
+    result = await risk_manager.check_limits(opportunity, make_exposure(), None, db_session)
+    assert result.allowed is False
+    assert result.details["current"] == 1
+
     # Allowed scenario
     opportunity = make_opportunity(amount=20.0, market=market)
     exposure = make_exposure(total=30.0, daily_traded=10.0)
@@ -180,7 +192,7 @@ async def test_position_manager_empty_positions(db_session: AsyncSession):
 
 
 async def test_exposure_report_calculation(db_session: AsyncSession):
-    now = datetime.utcnow()
+    now = utcnow()
     yesterday = now - timedelta(days=1)
 
     await insert_trade(
@@ -246,3 +258,57 @@ async def test_paper_trader_executes_opportunity(db_session: AsyncSession, tmp_p
     assert db_trade.entry_context is not None
 
     assert trade_log_path.exists()
+
+
+async def test_execute_opportunities_tracks_state_between_trades(db_session: AsyncSession, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "log_path", tmp_path / "logs")
+    monkeypatch.setattr(settings, "trade_log_path", tmp_path / "logs" / "trades.jsonl")
+
+    engine = TradingEngine(paper_trading=True)
+    first = make_market()
+    second = first.model_copy(update={"id": "polymarket:2", "market_id": "2"})
+    opportunities = [
+        make_opportunity(amount=10.0, market=first),
+        make_opportunity(amount=10.0, market=first),  # second position in the same market
+        make_opportunity(amount=20.0, market=second),
+    ]
+
+    results = await engine.execute_opportunities(opportunities, db_session)
+
+    assert [r.success for r in results] == [True, False, True]
+    assert "position(s) in this market" in results[1].error
+
+    assert len(await engine.get_positions(db_session)) == 2
+    exposure = await engine.get_exposure(db_session)
+    assert exposure.total_exposure == 30.0
+    assert exposure.daily_traded == 30.0
+
+
+async def test_paper_trader_executes_batch_with_one_commit(db_session: AsyncSession, tmp_path, monkeypatch):
+    trade_log_path = tmp_path / "logs" / "trades.jsonl"
+    monkeypatch.setattr(settings, "log_path", tmp_path / "logs")
+    monkeypatch.setattr(settings, "trade_log_path", trade_log_path)
+
+    commits = []
+    commit = db_session.commit
+
+    async def counting_commit():
+        commits.append(1)
+        await commit()
+
+    monkeypatch.setattr(db_session, "commit", counting_commit)
+
+    unpriced = make_market().model_copy(update={"no_price": None})
+    opportunities = [
+        make_opportunity(amount=10.0),
+        make_opportunity(amount=15.0, side="no", market=unpriced),
+        make_opportunity(amount=20.0, side="no"),
+    ]
+
+    results = await PaperTrader().execute_trades(opportunities, db_session)
+
+    assert [r.success for r in results] == [True, False, True]
+    assert len(commits) == 1
+    stored = (await db_session.execute(select(TradeDB))).scalars().all()
+    assert sorted(t.amount for t in stored) == [10.0, 20.0]
+    assert len(trade_log_path.read_text().splitlines()) == 2
@@ -0,0 +1,105 @@
+"""Batched JSONL trade log writer."""
+
+import asyncio
+from pathlib import Path
+from typing import Optional, TextIO
+
+import orjson
+
+from .config import settings
+
+
+_DUMP_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+
+class TradeLogWriter:
+    """Appends trade log entries to the JSONL log.
+
+    While started (inside the app lifespan), entries are queued and written
+    by a background task in batches of up to max_batch lines or max_delay
+    seconds, through a file handle that stays open. Before start() or after
+    stop(), write() appends synchronously, so scripts and tests that never
+    start the writer still see every entry on disk immediately.
+    """
+
+    def __init__(self, max_batch: int = 100, max_delay: float = 0.05):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue[str]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._file: Optional[TextIO] = None
+        # Directory already created for synchronous appends
+        self._sync_dir: Optional[Path] = None
+
+    async def start(self, path: Optional[Path] = None) -> None:
+        """Open the log and start the background writer."""
+        if self._task is not None:
+            return
+        path = path or settings.trade_log_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a")
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush queued entries, stop the writer and close the log."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._flush_pending()
+        self._file.close()
+        self._task = self._queue = self._file = None
+
+    def write(self, entry: dict) -> None:
+        """Log one entry (queued while started, synchronous otherwise).
+        
+        Entries may hold datetimes, enums and dicts as-is; orjson encodes
+        them, so callers needn't pre-convert with model_dump(mode="json").
+        """
+        line = orjson.dumps(entry, option=_DUMP_OPTIONS).decode()
+        if self._queue is not None:
+            self._queue.put_nowait(line)
+            return
+        path = settings.trade_log_path
+        if path.parent != self._sync_dir:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._sync_dir = path.parent
+        with open(path, "a") as f:
+            f.write(line)
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            try:
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            finally:
+                # Also runs on cancellation, so a half-collected batch is kept
+                self._file.write("".join(batch))
+                self._file.flush()
+
+    def _flush_pending(self) -> None:
+        """Write whatever is still queued (used on shutdown)."""
+        lines = []
+        while not self._queue.empty():
+            lines.append(self._queue.get_nowait())
+        if lines:
+            self._file.write("".join(lines))
+            self._file.flush()
+
+
+# Shared writer used by the API
+trade_log = TradeLogWriter()
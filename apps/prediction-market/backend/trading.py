@@ -1,18 +1,31 @@
 """Trading execution layer for the prediction market agent."""
 
-import json
 import uuid
+from collections import defaultdict
 from datetime import datetime, date
 from typing import Optional
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import String, cast, func, literal, null, select, union_all
 
 from .config import settings
-from .models.trade import Trade, TradeCreate, TradeDB, TradeStatus, TradeSide
+from .trade_log import trade_log
+from .models.trade import Trade, TradeCreate, TradeDB, TradeStatus, days_to_expiry, utcnow
 from .models.market import MarketOpportunity
 
 
+_today_start_cache: tuple[Optional[date], Optional[datetime]] = (None, None)
+
+
+def _today_start() -> datetime:
+    """Midnight today, recomputed only when the date rolls over."""
+    global _today_start_cache
+    today = date.today()
+    if _today_start_cache[0] != today:
+        _today_start_cache = (today, datetime.combine(today, datetime.min.time()))
+    return _today_start_cache[1]
+
+
 class Position(BaseModel):
     """Represents an open position."""
     trade_id: str
@@ -75,16 +88,20 @@ class RiskManager:
         self,
         opportunity: MarketOpportunity,
         current_exposure: ExposureReport,
-        existing_positions: list[Position],
+        existing_positions: Optional[list[Position]],
         db: AsyncSession,
     ) -> RiskCheckResult:
-        """Check all risk limits before executing a trade."""
+        """Check all risk limits before executing a trade.
+        
+        existing_positions is deprecated: pass None to count the positions
+        in the opportunity's market with a query instead.
+        """
         
         trade_amount = opportunity.recommended_amount
         
         # Check 1: Position size limit
         if trade_amount > self.max_position_size:
-            return RiskCheckResult(
+            return RiskCheckResult.model_construct(
                 allowed=False,
                 reason=f"Trade amount ${trade_amount:.2f} exceeds max position size ${self.max_position_size:.2f}",
                 details={"limit": "max_position_size", "requested": trade_amount, "max": self.max_position_size}
@@ -93,7 +110,7 @@ class RiskManager:
         # Check 2: Total exposure limit
         new_total = current_exposure.total_exposure + trade_amount
         if new_total > self.max_total_exposure:
-            return RiskCheckResult(
+            return RiskCheckResult.model_construct(
                 allowed=False,
                 reason=f"Trade would exceed max total exposure. Current: ${current_exposure.total_exposure:.2f}, After: ${new_total:.2f}, Max: ${self.max_total_exposure:.2f}",
                 details={"limit": "max_total_exposure", "current": current_exposure.total_exposure, "after": new_total, "max": self.max_total_exposure}
@@ -102,26 +119,29 @@ class RiskManager:
         # Check 3: Daily volume limit
         new_daily = current_exposure.daily_traded + trade_amount
         if new_daily > self.max_daily_volume:
-            return RiskCheckResult(
+            return RiskCheckResult.model_construct(
                 allowed=False,
                 reason=f"Trade would exceed daily limit. Today: ${current_exposure.daily_traded:.2f}, After: ${new_daily:.2f}, Limit: ${self.max_daily_volume:.2f}",
                 details={"limit": "daily_volume", "today": current_exposure.daily_traded, "after": new_daily, "max": self.max_daily_volume}
             )
         
         # Check 4: Max positions per market
-        market_positions = [
-            p for p in existing_positions
-            if p.platform == opportunity.market.platform and p.market_id == opportunity.market.market_id
-        ]
-        if len(market_positions) >= self.max_positions_per_market:
-            return RiskCheckResult(
+        if existing_positions is None:
+            market_positions = await self._count_market_positions(opportunity, db)
+        else:
+            market_positions = sum(
+                1 for p in existing_positions
+                if p.platform == opportunity.market.platform and p.market_id == opportunity.market.market_id
+            )
+        if market_positions >= self.max_positions_per_market:
+            return RiskCheckResult.model_construct(
                 allowed=False,
-                reason=f"Already have {len(market_positions)} position(s) in this market (max: {self.max_positions_per_market})",
-                details={"limit": "positions_per_market", "current": len(market_positions), "max": self.max_positions_per_market}
+                reason=f"Already have {market_positions} position(s) in this market (max: {self.max_positions_per_market})",
+                details={"limit": "positions_per_market", "current": market_positions, "max": self.max_positions_per_market}
             )
         
         # All checks passed
-        return RiskCheckResult(
+        return RiskCheckResult.model_construct(
             allowed=True,
             reason="All risk checks passed",
             details={
@@ -130,6 +150,17 @@ class RiskManager:
                 "new_daily_volume": new_daily,
             }
         )
+    
+    async def _count_market_positions(self, opportunity: MarketOpportunity, db: AsyncSession) -> int:
+        """Count open positions in the opportunity's market (an index lookup)."""
+        result = await db.execute(
+            select(func.count()).select_from(TradeDB).where(
+                TradeDB.market_id == opportunity.market.market_id,
+                TradeDB.platform == opportunity.market.platform,
+                TradeDB.status == TradeStatus.OPEN.value,
+            )
+        )
+        return result.scalar_one()
 
 
 class PositionManager:
@@ -137,67 +168,109 @@ class PositionManager:
     
     async def get_positions(self, db: AsyncSession) -> list[Position]:
         """Get all open positions."""
+        # Only the columns a Position needs, as plain rows (no ORM objects)
         result = await db.execute(
-            select(TradeDB).where(TradeDB.status == TradeStatus.OPEN.value)
+            select(
+                TradeDB.id, TradeDB.platform, TradeDB.market_id, TradeDB.market_question,
+                TradeDB.side, TradeDB.entry_price, TradeDB.amount, TradeDB.shares,
+                TradeDB.strategy, TradeDB.created_at,
+            ).where(TradeDB.status == TradeStatus.OPEN.value)
         )
-        trades = result.scalars().all()
         
-        positions = []
-        for trade in trades:
-            # For paper trading, current value = entry value (no live price updates)
-            current_value = trade.amount
-            unrealized_pnl = 0.0
-            
-            positions.append(Position(
-                trade_id=trade.id,
-                platform=trade.platform,
-                market_id=trade.market_id,
-                market_question=trade.market_question,
-                side=trade.side,
-                entry_price=trade.entry_price,
-                amount=trade.amount,
-                shares=trade.shares or 0,
-                current_value=current_value,
-                unrealized_pnl=unrealized_pnl,
-                strategy=trade.strategy,
-                opened_at=trade.created_at,
-            ))
+        # Column types already match, so skip validation. For paper trading,
+        # current value = entry value (no live price updates)
+        positions = [
+            Position.model_construct(
+                trade_id=trade_id,
+                platform=platform,
+                market_id=market_id,
+                market_question=market_question,
+                side=side,
+                entry_price=entry_price,
+                amount=amount,
+                shares=shares or 0,
+                current_value=amount,
+                unrealized_pnl=0.0,
+                strategy=strategy,
+                opened_at=created_at,
+            )
+            for (
+                trade_id, platform, market_id, market_question, side,
+                entry_price, amount, shares, strategy, created_at,
+            ) in result.all()
+        ]
         
         return positions
     
     async def get_exposure(self, db: AsyncSession) -> ExposureReport:
         """Calculate current exposure report."""
-        positions = await self.get_positions(db)
-        
-        total_exposure = sum(p.amount for p in positions)
-        by_platform: dict[str, float] = {}
-        by_strategy: dict[str, float] = {}
-        
-        for p in positions:
-            by_platform[p.platform] = by_platform.get(p.platform, 0) + p.amount
-            by_strategy[p.strategy] = by_strategy.get(p.strategy, 0) + p.amount
-        
-        # Calculate daily traded volume
-        today = date.today()
-        today_start = datetime.combine(today, datetime.min.time())
-        
-        result = await db.execute(
-            select(TradeDB).where(TradeDB.created_at >= today_start)
+        # Aggregate in SQL; the positions themselves are not needed. Today's
+        # volume comes back as an extra row without platform or strategy,
+        # so both aggregates take one round trip
+        open_by_group = (
+            select(TradeDB.platform, TradeDB.strategy, func.sum(TradeDB.amount), func.count())
+            .where(TradeDB.status == TradeStatus.OPEN.value)
+            .group_by(TradeDB.platform, TradeDB.strategy)
         )
-        today_trades = result.scalars().all()
-        daily_traded = sum(t.amount for t in today_trades)
-        
+        daily = select(
+            cast(null(), String), cast(null(), String), func.coalesce(func.sum(TradeDB.amount), 0.0), literal(0)
+        ).where(TradeDB.created_at >= _today_start())
+        result = await db.execute(union_all(open_by_group, daily))
+        
+        total_exposure = 0.0
+        position_count = 0
+        daily_traded = 0.0
+        by_platform: defaultdict[str, float] = defaultdict(float)
+        by_strategy: defaultdict[str, float] = defaultdict(float)
+        
+        for platform, strategy, amount, count in result.all():
+            if platform is None:
+                daily_traded = amount
+                continue
+            total_exposure += amount
+            position_count += count
+            by_platform[platform] += amount
+            by_strategy[strategy] += amount
+        
+        return self._exposure_report(
+            total_exposure, position_count, dict(by_platform), dict(by_strategy), daily_traded
+        )
+    
+    def add_trade(self, exposure: ExposureReport, trade: Trade) -> ExposureReport:
+        """Exposure after a just-opened trade, without re-reading it from the database."""
+        by_platform = dict(exposure.by_platform)
+        by_strategy = dict(exposure.by_strategy)
+        by_platform[trade.platform] = by_platform.get(trade.platform, 0) + trade.amount
+        by_strategy[trade.strategy] = by_strategy.get(trade.strategy, 0) + trade.amount
+        
+        return self._exposure_report(
+            exposure.total_exposure + trade.amount,
+            exposure.position_count + 1,
+            by_platform,
+            by_strategy,
+            exposure.daily_traded + trade.amount,
+        )
+    
+    @staticmethod
+    def _exposure_report(
+        total_exposure: float,
+        position_count: int,
+        by_platform: dict[str, float],
+        by_strategy: dict[str, float],
+        daily_traded: float,
+    ) -> ExposureReport:
+        # Every field is computed here with the right type, so skip validation
         daily_limit = settings.max_total_exposure * 2  # Allow 2x exposure per day
         
-        return ExposureReport(
+        return ExposureReport.model_construct(
             total_exposure=total_exposure,
-            available_capital=max(0, settings.max_total_exposure - total_exposure),
-            position_count=len(positions),
+            available_capital=max(0.0, settings.max_total_exposure - total_exposure),
+            position_count=position_count,
             by_platform=by_platform,
             by_strategy=by_strategy,
             daily_traded=daily_traded,
             daily_limit=daily_limit,
-            daily_remaining=max(0, daily_limit - daily_traded),
+            daily_remaining=max(0.0, daily_limit - daily_traded),
         )
 
 
@@ -213,9 +286,41 @@ class PaperTrader:
         db: AsyncSession,
     ) -> TradeResult:
         """Execute a paper trade - logs to database without real execution."""
+        result, log_entry = await self.stage_trade(opportunity, db)
+        if result.success:
+            await self.commit_trades(db, [log_entry])
+        return result
+    
+    async def execute_trades(
+        self,
+        opportunities: list[MarketOpportunity],
+        db: AsyncSession,
+    ) -> list[TradeResult]:
+        """Execute several paper trades with a single commit."""
+        results = []
+        log_entries = []
+        for opportunity in opportunities:
+            result, log_entry = await self.stage_trade(opportunity, db)
+            results.append(result)
+            if result.success:
+                log_entries.append(log_entry)
+        
+        await self.commit_trades(db, log_entries)
+        return results
+    
+    async def stage_trade(
+        self,
+        opportunity: MarketOpportunity,
+        db: AsyncSession,
+    ) -> tuple[TradeResult, Optional[dict]]:
+        """Flush a paper trade into the current transaction without committing.
+        
+        Later queries in the same session already see the trade. Returns the
+        result and the log entry to pass to commit_trades.
+        """
         
         trade_id = str(uuid.uuid4())
-        now = datetime.utcnow()
+        now = utcnow()
         
         # Calculate shares based on entry price
         entry_price = opportunity.market.yes_price if opportunity.recommended_side == "yes" else opportunity.market.no_price
@@ -224,7 +329,7 @@ class PaperTrader:
                 success=False,
                 error=f"Invalid entry price: {entry_price}",
                 paper_trade=True,
-            )
+            ), None
         
         shares = opportunity.recommended_amount / entry_price
         
@@ -238,12 +343,13 @@ class PaperTrader:
             market_question=opportunity.market.question,
             market_category=opportunity.market.category,
             market_end_date=opportunity.market.end_date,
+            days_to_expiry_at_entry=days_to_expiry(now, opportunity.market.end_date),
             side=opportunity.recommended_side,
             entry_price=entry_price,
             amount=opportunity.recommended_amount,
             shares=shares,
             strategy=opportunity.strategy,
-            entry_context=json.dumps({
+            entry_context={
                 "signal_strength": opportunity.signal_strength,
                 "expected_value": opportunity.expected_value,
                 "reasoning": opportunity.reasoning,
@@ -251,17 +357,15 @@ class PaperTrader:
                 "market_no_price": opportunity.market.no_price,
                 "market_volume": opportunity.market.volume,
                 "execution_mode": "paper",
-            }),
+            },
             status=TradeStatus.OPEN.value,
         )
         
         db.add(db_trade)
-        await db.commit()
-        await db.refresh(db_trade)
+        await db.flush()
         
-        # Log to JSONL
         log_entry = {
-            "timestamp": now.isoformat(),
+            "timestamp": now,
             "action": "paper_trade_executed",
             "trade_id": trade_id,
             "strategy": opportunity.strategy,
@@ -273,34 +377,19 @@ class PaperTrader:
             "reasoning": opportunity.reasoning,
         }
         
-        settings.log_path.mkdir(parents=True, exist_ok=True)
-        with open(settings.trade_log_path, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
-        
-        # Convert to Trade model
-        trade = Trade(
-            id=db_trade.id,
-            created_at=db_trade.created_at,
-            updated_at=db_trade.updated_at,
-            platform=db_trade.platform,
-            market_id=db_trade.market_id,
-            market_question=db_trade.market_question,
-            market_category=db_trade.market_category,
-            market_end_date=db_trade.market_end_date,
-            side=TradeSide(db_trade.side),
-            entry_price=db_trade.entry_price,
-            amount=db_trade.amount,
-            shares=db_trade.shares,
-            strategy=db_trade.strategy,
-            entry_context=json.loads(db_trade.entry_context) if db_trade.entry_context else None,
-            status=TradeStatus(db_trade.status),
-        )
-        
+        # Every column was set above, so no refresh is needed
         return TradeResult(
             success=True,
-            trade=trade,
+            trade=Trade.model_validate(db_trade),
             paper_trade=True,
-        )
+        ), log_entry
+    
+    async def commit_trades(self, db: AsyncSession, log_entries: list[dict]) -> None:
+        """Commit staged trades, then log them to JSONL."""
+        await db.commit()
+        
+        for log_entry in log_entries:
+            trade_log.write(log_entry)
 
 
 class LiveTrader:
@@ -317,6 +406,17 @@ class LiveTrader:
             "Platform adapters for Polymarket/Kalshi need to be integrated. "
             "Use paper_trading=True in config for now."
         )
+    
+    async def stage_trade(
+        self,
+        opportunity: MarketOpportunity,
+        db: AsyncSession,
+    ) -> tuple[TradeResult, Optional[dict]]:
+        """Execute a live trade as part of a batch."""
+        return await self.execute_trade(opportunity, db), None
+    
+    async def commit_trades(self, db: AsyncSession, log_entries: list[dict]) -> None:
+        """Live trades are committed as they execute."""
 
 
 class TradingEngine:
@@ -351,7 +451,6 @@ class TradingEngine:
         """
         
         # Get current state
-        positions = await self.position_manager.get_positions(db)
         exposure = await self.position_manager.get_exposure(db)
         
         # Run risk checks unless forced
@@ -359,7 +458,7 @@ class TradingEngine:
             risk_check = await self.risk_manager.check_limits(
                 opportunity=opportunity,
                 current_exposure=exposure,
-                existing_positions=positions,
+                existing_positions=None,
                 db=db,
             )
             
@@ -375,6 +474,59 @@ class TradingEngine:
         
         return result
     
+    async def execute_opportunities(
+        self,
+        opportunities: list[MarketOpportunity],
+        db: AsyncSession,
+        force: bool = False,
+    ) -> list[TradeResult]:
+        """
+        Execute several opportunities, reading the exposure once.
+        
+        Each opportunity is risk-checked against the state left by the ones
+        before it, exactly as if execute_opportunity were called in a loop,
+        but all trades are committed together.
+        
+        Args:
+            opportunities: The market opportunities to trade, in order
+            db: Database session
+            force: If True, skip risk checks (use with caution!)
+        
+        Returns:
+            One TradeResult per opportunity
+        """
+        exposure = await self.position_manager.get_exposure(db)
+        
+        results = []
+        log_entries = []
+        for opportunity in opportunities:
+            if not force:
+                risk_check = await self.risk_manager.check_limits(
+                    opportunity=opportunity,
+                    current_exposure=exposure,
+                    existing_positions=None,
+                    db=db,
+                )
+                
+                if not risk_check.allowed:
+                    results.append(TradeResult(
+                        success=False,
+                        error=risk_check.reason,
+                        paper_trade=self.paper_trading,
+                    ))
+                    continue
+            
+            # Staged trades are flushed, so the per-market count sees them
+            result, log_entry = await self.trader.stage_trade(opportunity, db)
+            if result.success:
+                exposure = self.position_manager.add_trade(exposure, result.trade)
+                if log_entry is not None:
+                    log_entries.append(log_entry)
+            results.append(result)
+        
+        await self.trader.commit_trades(db, log_entries)
+        return results
+    
     async def check_risk_limits(
         self,
         opportunity: MarketOpportunity,
@@ -382,13 +534,12 @@ class TradingEngine:
     ) -> RiskCheckResult:
         """Check if an opportunity passes risk limits without executing."""
         
-        positions = await self.position_manager.get_positions(db)
         exposure = await self.position_manager.get_exposure(db)
         
         return await self.risk_manager.check_limits(
             opportunity=opportunity,
             current_exposure=exposure,
-            existing_positions=positions,
+            existing_positions=None,
             db=db,
         )
     
@@ -10,35 +10,82 @@ Designed to be run as a Clawdbot cron job.
 
 import asyncio
 import argparse
-import json
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import or_, select, update
 from backend.platforms import PolymarketAdapter
-from backend.db.database import AsyncSessionLocal, init_db
-from backend.models.trade import TradeDB, TradeStatus
+from backend.db.database import AsyncSessionLocal, init_db_once
+from backend.models.trade import TradeDB, TradeStatus, utcnow
 from backend.config import settings
 
 
+# JSONL log lines: one object per line
+JSONL_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
 # Output paths
 DATA_DIR = PROJECT_ROOT / "data"
 LESSONS_FILE = DATA_DIR / "lessons_learned.jsonl"
 RESOLUTION_LOG = DATA_DIR / "resolution_log.jsonl"
+# Schema fingerprint from the last run that initialized the database
+DB_INIT_MARKER = DATA_DIR / ".db_initialized"
 
+# Platforms whose markets we can check for resolution
+CHECKED_PLATFORMS = ("polymarket",)
 
-async def get_open_trades() -> list[TradeDB]:
-    """Fetch all open trades from database."""
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            select(TradeDB).where(TradeDB.status == TradeStatus.OPEN.value)
+# Gamma API requests in flight at once while checking markets
+MAX_CONCURRENT_CHECKS = 10
+# Default cap on Gamma API requests per second (see --max-rate)
+MAX_REQUESTS_PER_SECOND = 20.0
+
+
+class RateLimiter:
+    """Spaces requests out to at most `rate` per second, without bursts."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next_slot = 0.0
+    
+    async def __aenter__(self):
+        # Claim the next free slot before awaiting, so concurrent callers
+        # each get their own
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+async def get_open_trades(
+    platforms: tuple[str, ...] = CHECKED_PLATFORMS,
+    ended_before: Optional[datetime] = None,
+) -> list[TradeDB]:
+    """Fetch open trades on the given platforms from database.
+    
+    With ended_before, skip trades whose market is known to end later.
+    """
+    query = select(TradeDB).where(
+        TradeDB.status == TradeStatus.OPEN.value,
+        TradeDB.platform.in_(platforms),
+    )
+    if ended_before is not None:
+        query = query.where(
+            or_(TradeDB.market_end_date.is_(None), TradeDB.market_end_date <= ended_before)
         )
-        return list(result.scalars().all())
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(query)
+        return result.scalars().all()
 
 
 async def check_market_resolution(adapter: PolymarketAdapter, market_id: str) -> dict:
@@ -57,6 +104,30 @@ async def check_market_resolution(adapter: PolymarketAdapter, market_id: str) ->
     }
 
 
+async def check_market_resolutions(
+    adapter: PolymarketAdapter,
+    market_ids: list[str],
+    max_rate: float = MAX_REQUESTS_PER_SECOND,
+) -> dict[str, dict | None | BaseException]:
+    """Check many markets concurrently, once per distinct market.
+    
+    At most MAX_CONCURRENT_CHECKS requests are in flight, started at no
+    more than max_rate per second. Maps each market ID to its resolution
+    (as check_market_resolution), or to the exception raised while
+    fetching it.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+    limiter = RateLimiter(max_rate)
+    
+    async def bounded(market_id: str) -> dict:
+        async with semaphore, limiter:
+            return await check_market_resolution(adapter, market_id)
+    
+    unique_ids = list(dict.fromkeys(market_ids))
+    resolutions = await asyncio.gather(*(bounded(m) for m in unique_ids), return_exceptions=True)
+    return dict(zip(unique_ids, resolutions))
+
+
 def calculate_pnl(trade: TradeDB, outcome: str) -> tuple[float, float]:
     """Calculate P&L and ROI for a resolved trade."""
     # If we bet YES and outcome is YES, we win
@@ -93,8 +164,25 @@ def calculate_clv(trade: TradeDB, closing_price: float) -> tuple[float, bool]:
     return clv, beat_clv
 
 
-def generate_lessons(trade: TradeDB, resolution: dict, pnl: float, clv: float, beat_clv: bool) -> dict:
-    """Generate lessons learned from a resolved trade."""
+def naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """dt as naive UTC, comparable with stored trade timestamps."""
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def generate_lessons(
+    trade: TradeDB,
+    resolution: dict,
+    pnl: float,
+    clv: float,
+    beat_clv: bool,
+    resolved_at: Optional[datetime] = None,
+) -> dict:
+    """Generate lessons learned from a resolved trade.
+    
+    resolved_at is the market's resolution date as naive UTC (see naive_utc).
+    """
     won = pnl > 0
     
     lessons = {
@@ -138,59 +226,50 @@ def generate_lessons(trade: TradeDB, resolution: dict, pnl: float, clv: float, b
             lessons["action_items"].append("Add this pattern to watchlist")
     
     # Time-based insights
-    if trade.created_at and resolution.get("resolution_date"):
-        try:
-            res_date = datetime.fromisoformat(resolution["resolution_date"].replace("Z", "+00:00"))
-            hold_days = (res_date - trade.created_at).days
-            if hold_days > 30:
-                lessons["insights"].append(f"📅 Long hold period ({hold_days} days) - capital was locked")
-        except Exception:
-            pass
+    if trade.created_at and resolved_at:
+        hold_days = (resolved_at - trade.created_at).days
+        if hold_days > 30:
+            lessons["insights"].append(f"📅 Long hold period ({hold_days} days) - capital was locked")
     
     return lessons
 
 
-async def update_trade(trade_id: str, updates: dict):
-    """Update a trade in the database."""
+async def update_trades(updates: list[dict], now: Optional[datetime] = None):
+    """Apply per-trade updates (each including its trade "id") in one transaction."""
+    if not updates:
+        return
+    now = now or datetime.now(timezone.utc)
     async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            select(TradeDB).where(TradeDB.id == trade_id)
-        )
-        trade = result.scalar_one_or_none()
-        if trade:
-            for key, value in updates.items():
-                setattr(trade, key, value)
-            trade.updated_at = datetime.now(timezone.utc)
-            await session.commit()
-            return True
-    return False
-
-
-def log_lessons(lessons: dict):
-    """Log lessons learned to JSONL file."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    
-    with open(LESSONS_FILE, "a") as f:
-        entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            **lessons
-        }
-        f.write(json.dumps(entry) + "\n")
+        # ORM bulk UPDATE by primary key: one executemany, no SELECTs
+        await session.execute(update(TradeDB), [{**u, "updated_at": now} for u in updates])
+        await session.commit()
 
 
-def log_resolution(trade_id: str, resolution: dict, pnl: float, roi: float):
-    """Log resolution event."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    
-    with open(RESOLUTION_LOG, "a") as f:
-        entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+def encode_lessons(all_lessons: list[dict], timestamp: datetime) -> bytes:
+    """JSONL lines for the lessons learned file."""
+    return b"".join(
+        orjson.dumps({"timestamp": timestamp, **lessons}, option=JSONL_OPTIONS) for lessons in all_lessons
+    )
+
+
+def encode_resolutions(resolutions: list[tuple[str, dict, float, float]], timestamp: datetime) -> bytes:
+    """JSONL lines for resolution events given as (trade_id, resolution, pnl, roi)."""
+    return b"".join(
+        orjson.dumps({
+            "timestamp": timestamp,
             "trade_id": trade_id,
             "resolution": resolution,
             "pnl": pnl,
             "roi": roi,
-        }
-        f.write(json.dumps(entry) + "\n")
+        }, option=JSONL_OPTIONS)
+        for trade_id, resolution, pnl, roi in resolutions
+    )
+
+
+def append_log(path: Path, data: bytes):
+    """Append encoded JSONL lines to a log file (one write per run)."""
+    with open(path, "ab") as f:
+        f.write(data)
 
 
 async def main():
@@ -199,36 +278,53 @@ async def main():
                         help="Don't update database, just print")
     parser.add_argument("--output-json", action="store_true",
                         help="Output results as JSON for Clawdbot")
+    parser.add_argument("--ended-only", action="store_true",
+                        help="Skip trades whose market end date hasn't passed "
+                             "(markets that resolve early are picked up later)")
+    parser.add_argument("--max-rate", type=float, default=MAX_REQUESTS_PER_SECOND,
+                        help="Max Polymarket API requests per second")
     args = parser.parse_args()
     
-    # Initialize database
-    await init_db()
+    # Log files below are appended to without re-checking the directory
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    
+    # Initialize database (skipped while the schema is unchanged)
+    await init_db_once(DB_INIT_MARKER)
     
     print(f"[{datetime.now().isoformat()}] Checking for resolved trades...")
     
     # Get open trades
-    open_trades = await get_open_trades()
+    open_trades = await get_open_trades(ended_before=utcnow() if args.ended_only else None)
     print(f"  Found {len(open_trades)} open trades")
     
     if not open_trades:
         if args.output_json:
-            print(json.dumps({"status": "no_open_trades"}))
+            print(orjson.dumps({"status": "no_open_trades"}).decode())
         return
     
     adapter = PolymarketAdapter()
     resolved_count = 0
     total_pnl = 0
     results = []
+    trade_updates = []
+    lessons_log = []
+    resolution_log = []
     
     try:
+        resolutions = await check_market_resolutions(
+            adapter, [t.market_id for t in open_trades], max_rate=args.max_rate
+        )
+        # One timestamp for everything recorded in this run
+        checked_at = datetime.now(timezone.utc)
+        
         for trade in open_trades:
-            # Only check Polymarket trades for now
-            if trade.platform != "polymarket":
-                continue
-            
             print(f"  Checking: {trade.market_question[:50]}...")
             
-            resolution = await check_market_resolution(adapter, trade.market_id)
+            resolution = resolutions[trade.market_id]
+            
+            if isinstance(resolution, BaseException):
+                print(f"    Could not fetch market data: {resolution!r}")
+                continue
             
             if not resolution:
                 print(f"    Could not fetch market data")
@@ -257,7 +353,10 @@ async def main():
                 print(f"    CLV: {clv:.4f} (Beat line: {beat_clv})")
             
             # Generate lessons
-            lessons = generate_lessons(trade, resolution, pnl, clv, beat_clv)
+            lessons = generate_lessons(
+                trade, resolution, pnl, clv, beat_clv,
+                resolved_at=naive_utc(resolution.get("resolution_date")),
+            )
             
             results.append({
                 "trade_id": trade.id,
@@ -273,27 +372,41 @@ async def main():
             total_pnl += pnl
             
             if not args.dry_run:
-                # Update database
-                updates = {
+                # Queue the database update
+                trade_updates.append({
+                    "id": trade.id,
                     "status": status.value,
-                    "resolution_date": datetime.now(timezone.utc),
+                    "resolution_date": checked_at,
                     "resolution_outcome": outcome,
                     "closing_price": closing_price,
                     "pnl": pnl,
                     "roi": roi,
                     "clv": clv,
                     "was_good_trade": beat_clv,
-                    "lessons": json.dumps(lessons["insights"]),
-                }
-                await update_trade(trade.id, updates)
-                
-                # Log
-                log_lessons(lessons)
-                log_resolution(trade.id, resolution, pnl, roi)
+                    "lessons": orjson.dumps(lessons["insights"]).decode(),
+                })
+                lessons_log.append(lessons)
+                resolution_log.append((trade.id, resolution, pnl, roi))
     
     finally:
         await adapter.close()
     
+    if not args.dry_run and trade_updates:
+        # Update database once for all resolved trades; the log lines are
+        # encoded in a worker thread meanwhile, but only written once the
+        # update has committed
+        _, (lessons_data, resolutions_data) = await asyncio.gather(
+            update_trades(trade_updates, checked_at),
+            asyncio.to_thread(
+                lambda: (
+                    encode_lessons(lessons_log, checked_at),
+                    encode_resolutions(resolution_log, checked_at),
+                )
+            ),
+        )
+        append_log(LESSONS_FILE, lessons_data)
+        append_log(RESOLUTION_LOG, resolutions_data)
+    
     # Summary
     print(f"\n{'='*60}")
     print(f"RESOLUTION CHECK COMPLETE")
@@ -309,7 +422,7 @@ async def main():
             "total_pnl": total_pnl,
             "results": results,
         }
-        print(json.dumps(output, indent=2))
+        print(orjson.dumps(output, option=orjson.OPT_INDENT_2).decode())
     
     # Return high-level summary
     if resolved_count > 0:
@@ -10,20 +10,25 @@ Designed to be run as a Clawdbot cron job.
 
 import asyncio
 import argparse
-import json
+import heapq
 import sys
 from datetime import datetime, timezone
+from operator import attrgetter
 from pathlib import Path
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+import orjson
 from backend.platforms import PolymarketAdapter
 from backend.strategies import NothingEverHappensStrategy, YieldFarmingStrategy
 from backend.config import settings
 
 
+# JSONL log lines: one object per line
+JSONL_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
 # Output paths
 DATA_DIR = PROJECT_ROOT / "data"
 OPPORTUNITIES_FILE = DATA_DIR / "opportunities.jsonl"
@@ -42,39 +47,44 @@ async def fetch_markets(adapter: PolymarketAdapter, min_volume: float = 1000) ->
     print(f"[{datetime.now().isoformat()}] Fetching markets from Polymarket...")
     
     # Fetch markets in batches (API limit is typically 100)
-    all_markets = []
+    # Keyed by market_id, so duplicates across pages are dropped as we go
+    unique_by_id = {}
     batch_size = 100
     
-    # Fetch multiple pages
-    for page in range(5):  # Up to 500 markets
-        try:
-            markets = await adapter.get_markets(
+    # Fetch all pages at once (up to 500 markets), then use them in order
+    # up to the first failed, empty or short page, like paging one by one
+    pages = await asyncio.gather(
+        *(
+            adapter.get_markets(
                 limit=batch_size,
                 active_only=True,
                 closed=False,
+                offset=page * batch_size,
+                min_volume=min_volume,
             )
-            
-            if not markets:
-                break
-            
-            # Filter by volume
-            filtered = [m for m in markets if (m.volume or 0) >= min_volume]
-            all_markets.extend(filtered)
-            
-            if len(markets) < batch_size:
-                break  # No more results
-                
-        except Exception as e:
-            print(f"  Error fetching batch {page}: {e}")
+            for page in range(5)
+        ),
+        return_exceptions=True,
+    )
+    
+    for page, markets in enumerate(pages):
+        if isinstance(markets, Exception):
+            print(f"  Error fetching batch {page}: {markets}")
             break
+        
+        if not markets:
+            break
+        
+        # Gamma filters by volume already; this also drops markets
+        # with no volume data
+        for m in markets:
+            if (m.volume or 0) >= min_volume:
+                unique_by_id.setdefault(m.market_id, m)
+        
+        if len(markets) < batch_size:
+            break  # No more results
     
-    # Deduplicate by market_id
-    seen = set()
-    unique_markets = []
-    for m in all_markets:
-        if m.market_id not in seen:
-            seen.add(m.market_id)
-            unique_markets.append(m)
+    unique_markets = list(unique_by_id.values())
     
     print(f"  Found {len(unique_markets)} active markets with volume >= ${min_volume}")
     
@@ -112,36 +122,37 @@ def log_opportunities(opportunities: list, dry_run: bool = False):
             print(f"  - {opp.strategy}: {opp.market.question[:50]}... (EV: {opp.expected_value:.2%})")
         return
     
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now(timezone.utc)
+    lines = [
+        orjson.dumps({
+            "timestamp": timestamp,
+            "strategy": opp.strategy,
+            "market_id": opp.market.market_id,
+            "platform": opp.market.platform,
+            "question": opp.market.question,
+            "signal_strength": opp.signal_strength,
+            "recommended_side": opp.recommended_side,
+            "recommended_amount": opp.recommended_amount,
+            "expected_value": opp.expected_value,
+            "yes_price": opp.market.yes_price,
+            "no_price": opp.market.no_price,
+            "volume": opp.market.volume,
+            "reasoning": opp.reasoning,
+        }, option=JSONL_OPTIONS)
+        for opp in opportunities
+    ]
     
-    with open(OPPORTUNITIES_FILE, "a") as f:
-        for opp in opportunities:
-            entry = {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "strategy": opp.strategy,
-                "market_id": opp.market.market_id,
-                "platform": opp.market.platform,
-                "question": opp.market.question,
-                "signal_strength": opp.signal_strength,
-                "recommended_side": opp.recommended_side,
-                "recommended_amount": opp.recommended_amount,
-                "expected_value": opp.expected_value,
-                "yes_price": opp.market.yes_price,
-                "no_price": opp.market.no_price,
-                "volume": opp.market.volume,
-                "reasoning": opp.reasoning,
-            }
-            f.write(json.dumps(entry) + "\n")
+    # One write for the whole scan
+    with open(OPPORTUNITIES_FILE, "ab") as f:
+        f.write(b"".join(lines))
     
     print(f"  Logged {len(opportunities)} opportunities to {OPPORTUNITIES_FILE}")
 
 
 def log_scan(scan_result: dict):
     """Log scan metadata."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    
-    with open(SCAN_LOG_FILE, "a") as f:
-        f.write(json.dumps(scan_result) + "\n")
+    with open(SCAN_LOG_FILE, "ab") as f:
+        f.write(orjson.dumps(scan_result, option=JSONL_OPTIONS))
 
 
 def get_high_value_opportunities(opportunities: list, threshold: float = 0.1) -> list:
@@ -159,7 +170,8 @@ def format_alert(opportunities: list) -> str:
     
     lines = ["🎯 **Prediction Market Opportunities Found**\n"]
     
-    for opp in sorted(opportunities, key=lambda x: x.expected_value, reverse=True)[:10]:
+    # Top 10 by EV without sorting everything (same order as a stable sort)
+    for opp in heapq.nlargest(10, opportunities, key=attrgetter("expected_value")):
         lines.append(
             f"• **{opp.strategy}**: {opp.market.question[:60]}..."
             f"\n  └ {opp.recommended_side.upper()} @ {opp.market.yes_price if opp.recommended_side == 'yes' else opp.market.no_price:.0%}"
@@ -183,6 +195,9 @@ async def main():
                         help="Output results as JSON for Clawdbot")
     args = parser.parse_args()
     
+    # Log files below are appended to without re-checking the directory
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    
     strategy_names = None
     if args.strategies:
         strategy_names = [s.strip() for s in args.strategies.split(",")]
@@ -209,7 +224,7 @@ async def main():
         
         # Log scan metadata
         scan_result = {
-            "timestamp": scan_start.isoformat(),
+            "timestamp": scan_start,
             "duration_seconds": (datetime.now(timezone.utc) - scan_start).total_seconds(),
             "markets_scanned": len(markets),
             "opportunities_found": len(opportunities),
@@ -235,7 +250,7 @@ async def main():
                     for opp in high_value
                 ]
             }
-            print(json.dumps(output, indent=2))
+            print(orjson.dumps(output, option=orjson.OPT_INDENT_2).decode())
         else:
             # Human-readable summary
             print(f"\n{'='*60}")